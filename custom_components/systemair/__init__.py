@@ -7,18 +7,26 @@ https://github.com/tesharp/systemair-save-connect
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_IP_ADDRESS, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import SystemairApiClient
+from . import binary_sensor, climate, number, sensor, switch
+from .client import create_client, create_limits
+from .const import DOMAIN
 from .coordinator import SystemairDataUpdateCoordinator
 from .data import SystemairData
+from .services import async_setup_services
+from .store import async_remove_store
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import EntityDescription
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import SystemairConfigEntry
 
@@ -30,6 +38,22 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
 ]
 
+PLATFORM_MODULES = {
+    Platform.CLIMATE: climate,
+    Platform.SENSOR: sensor,
+    Platform.BINARY_SENSOR: binary_sensor,
+    Platform.SWITCH: switch,
+    Platform.NUMBER: number,
+}
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001 Unused function argument: `config`
+    """Set up the Systemair integration."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -37,39 +61,73 @@ async def async_setup_entry(
     entry: SystemairConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    start = time.monotonic()
     coordinator = SystemairDataUpdateCoordinator(
         hass=hass,
     )
     entry.runtime_data = SystemairData(
-        client=SystemairApiClient(
-            address=entry.data[CONF_IP_ADDRESS],
-            session=async_get_clientsession(hass),
-        ),
+        client=create_client(hass, entry.data, entry.options),
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
     )
 
+    # Register the registers read by the entities of each platform up front, so the first refresh reads all of
+    # them at once. Registers of disabled entities are not read, enabling an entity reloads the entry
+    entity_registry = er.async_get(hass)
+    for platform, module in PLATFORM_MODULES.items():
+        for entity_description, modbus_parameters in module.ENTITY_REGISTERS:
+            if _entity_enabled(entity_registry, platform, entry, entity_description):
+                for modbus_parameter in modbus_parameters:
+                    coordinator.register_modbus_parameters(modbus_parameter)
+
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    # Only waits for the unit on the first setup, later setups read it in the background
     await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.runtime_data.setup_duration = time.monotonic() - start
 
     return True
 
 
+def _entity_enabled(
+    entity_registry: er.EntityRegistry,
+    platform: Platform,
+    entry: SystemairConfigEntry,
+    entity_description: EntityDescription,
+) -> bool:
+    """Return whether the entity of a description is enabled, by default when it was not added yet."""
+    entity_id = entity_registry.async_get_entity_id(platform, DOMAIN, f"{entry.entry_id}-{entity_description.key}")
+    if entity_id is None or (entity_entry := entity_registry.async_get(entity_id)) is None:
+        return entity_description.entity_registry_enabled_default
+    return not entity_entry.disabled
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: SystemairConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # Pending writes are cancelled before the client they are sent with is closed
+        await entry.runtime_data.coordinator.async_shutdown()
+        await entry.runtime_data.client.async_close()
+    return unload_ok
 
 
-async def async_reload_entry(
+async def async_remove_entry(
     hass: HomeAssistant,
     entry: SystemairConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Remove what is stored about the unit."""
+    await async_remove_store(hass, entry.entry_id)
+
+
+async def async_update_options(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: SystemairConfigEntry,
+) -> None:
+    """Apply changed options to the running client and coordinator, without reloading the entry."""
+    entry.runtime_data.client.set_limits(create_limits(entry.options))
+    entry.runtime_data.coordinator.async_apply_options()
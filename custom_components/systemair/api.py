@@ -2,18 +2,57 @@
 
 from __future__ import annotations
 
-import asyncio.exceptions
+import asyncio
+import random
+import re
 import socket
+import time
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
+import orjson
 
-from .const import LOGGER
+from .breaker import CircuitBreaker
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REGISTER_GAP,
+    DEFAULT_MAX_REGISTERS_PER_REQUEST,
+    DEFAULT_MAX_URL_LENGTH,
+    LOGGER,
+    MIN_REQUEST_TIMEOUT,
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    REQUEST_TIMEOUT,
+    RETRY_CONNECTION_ATTEMPTS,
+    RETRY_CONNECTION_BASE_DELAY,
+    RETRY_CONNECTION_MAX_DELAY,
+    RETRY_DISCONNECTED_ATTEMPTS,
+    RETRY_DISCONNECTED_BASE_DELAY,
+    RETRY_DISCONNECTED_MAX_DELAY,
+    RETRY_TIMEOUT_ATTEMPTS,
+    RETRY_TIMEOUT_BASE_DELAY,
+    RETRY_TIMEOUT_MAX_DELAY,
+)
+from .latency import LatencyTracker
+from .limiter import PriorityLimiter
+from .metrics import RequestMetrics
+from .planner import MAX_SPAN_REGISTERS, RegisterSpan, expand_span_response, plan_register_spans
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
     from .modbus import ModbusParameter
 
+# Status codes returned by the IAM web server when a query is too long
+REQUEST_TOO_LARGE_STATUSES = (413, 414, 431)
+# Some web servers answer a too long query with a plain Bad Request, only telling why in the body
+BAD_REQUEST_TOO_LARGE = re.compile(rb"too (long|large)", re.IGNORECASE)
+
 
 class SystemairApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -25,17 +64,167 @@ class SystemairApiClientCommunicationError(
     """Exception to indicate a communication error."""
 
 
-class SystemairApiClient:
-    """Systemair API Client."""
+class SystemairApiClientRequestTooLargeError(
+    SystemairApiClientCommunicationError,
+):
+    """Exception to indicate the unit rejected a request for being too large."""
+
+
+class SystemairApiClientDisconnectedError(
+    SystemairApiClientCommunicationError,
+):
+    """Exception to indicate the IAM lost its connection to the unit."""
+
+
+class SystemairApiClientUnavailableError(
+    SystemairApiClientCommunicationError,
+):
+    """Exception to indicate requests are paused, as the unit kept failing."""
+
+
+@dataclass(kw_only=True, frozen=True)
+class DeviceIdentity:
+    """Information identifying a unit, None where the transport cannot tell."""
+
+    mac_address: str | None = None
+    serial_number: str | None = None
+    mb_hw_version: str | None = None
+    mb_model: str | None = None
+    mb_sw_version: str | None = None
+    iam_sw_version: str | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class RetryPolicy:
+    """Describes how often and how fast a kind of failed request is retried."""
+
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before the next attempt, an exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # noqa: S311 Not used for cryptographic purposes
+
+
+@dataclass(kw_only=True)
+class SystemairApiClientLimits:
+    """Limits for requests sent to the unit."""
+
+    max_register_gap: int = DEFAULT_MAX_REGISTER_GAP
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH
+    max_registers_per_request: int = DEFAULT_MAX_REGISTERS_PER_REQUEST
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    # Timeouts adapt to the latency observed for the unit, within these bounds
+    request_timeout: float = REQUEST_TIMEOUT
+    min_request_timeout: float = MIN_REQUEST_TIMEOUT
+    retry_disconnected: RetryPolicy = field(
+        default_factory=lambda: RetryPolicy(
+            attempts=RETRY_DISCONNECTED_ATTEMPTS,
+            base_delay=RETRY_DISCONNECTED_BASE_DELAY,
+            max_delay=RETRY_DISCONNECTED_MAX_DELAY,
+        )
+    )
+    retry_timeout: RetryPolicy = field(
+        default_factory=lambda: RetryPolicy(
+            attempts=RETRY_TIMEOUT_ATTEMPTS,
+            base_delay=RETRY_TIMEOUT_BASE_DELAY,
+            max_delay=RETRY_TIMEOUT_MAX_DELAY,
+        )
+    )
+    retry_connection: RetryPolicy = field(
+        default_factory=lambda: RetryPolicy(
+            attempts=RETRY_CONNECTION_ATTEMPTS,
+            base_delay=RETRY_CONNECTION_BASE_DELAY,
+            max_delay=RETRY_CONNECTION_MAX_DELAY,
+        )
+    )
+
+    def retry_policy(self, exception: Exception) -> RetryPolicy | None:
+        """Return the retry policy for a failed request, None if it should not be retried."""
+        if isinstance(exception, SystemairApiClientDisconnectedError):
+            return self.retry_disconnected
+        if isinstance(exception, TimeoutError):
+            return self.retry_timeout
+        if isinstance(exception, aiohttp.ClientError | socket.gaierror):
+            return self.retry_connection
+        return None
+
+
+class SystemairTransport(ABC):
+    """Interface for the ways of communicating with a Systemair unit."""
+
+    # Pauses requests to a unit that keeps failing
+    breaker: CircuitBreaker
+    # Requests, retries and errors since the client was created
+    metrics: RequestMetrics
+
+    @property
+    @abstractmethod
+    def address(self) -> str:
+        """Return the address of the unit, unique per unit."""
+
+    @abstractmethod
+    async def async_test_connection(self) -> Any:
+        """Test connection to the unit."""
+
+    @abstractmethod
+    async def async_get_device_identity(self) -> DeviceIdentity:
+        """Get information identifying the unit."""
+
+    @abstractmethod
+    async def async_get_data(self, reg: Iterable[ModbusParameter]) -> dict[int, Any]:
+        """Read modbus registers, keyed by zero based register address."""
+
+    @abstractmethod
+    def plan_requests(self, reg: Iterable[ModbusParameter]) -> list[list[RegisterSpan]]:
+        """Return the spans read by each request async_get_data sends for the registers."""
+
+    async def async_set_data(self, registry: ModbusParameter, value: int) -> Any:
+        """Write data to the unit."""
+        return await self.async_set_data_batch({registry: value})
+
+    @abstractmethod
+    async def async_set_data_batch(self, values: Mapping[ModbusParameter, int]) -> Any:
+        """Write several registers to the unit."""
+
+    @abstractmethod
+    async def async_close(self) -> None:
+        """Release any connection held to the unit."""
+
+    @abstractmethod
+    def set_limits(self, limits: SystemairApiClientLimits) -> None:
+        """Apply new request limits."""
+
+
+class SystemairApiClient(SystemairTransport):
+    """Systemair API Client, using the web interface of the SAVE Connect IAM."""
 
     def __init__(
         self,
         address: str,
         session: aiohttp.ClientSession,
+        limits: SystemairApiClientLimits | None = None,
+        limiter: PriorityLimiter | None = None,
     ) -> None:
-        """Systemair API Client."""
+        """Systemair API Client, `limiter` being shared with the clients of other units."""
         self._address = address
         self._session = session
+        self._limits = limits or SystemairApiClientLimits()
+        # Requests to this unit, with writes going ahead of waiting reads
+        self._request_limiter = PriorityLimiter(self._limits.max_concurrent_requests)
+        self._limiter = limiter
+        self.breaker = CircuitBreaker()
+        self.metrics = RequestMetrics()
+        self.latency = LatencyTracker(self._limits.min_request_timeout, self._limits.request_timeout)
+        # Learned from requests the unit rejected, None until the first rejection
+        self._max_spans_per_request: int | None = None
+        self._max_registers_per_request: int | None = None
+
+    @property
+    def address(self) -> str:
+        """Return the address of the web interface."""
+        return self._address
 
     async def async_test_connection(self) -> Any:
         """Test connection to API."""
@@ -45,61 +234,206 @@ class SystemairApiClient:
         """Get information from the API."""
         return await self._api_wrapper(method="get", url=f"http://{self._address}/{endpoint}")
 
-    async def async_get_data(self, reg: list[ModbusParameter]) -> Any:
-        """Read modbus registers."""
-        query_params = ",".join(f"%22{item.register - 1}%22:1" for item in reg)
-        url = f"http://{self._address}/mread?{{{query_params}}}"
+    async def async_close(self) -> None:
+        """Nothing to release, the session is shared with Home Assistant."""
+
+    def set_limits(self, limits: SystemairApiClientLimits) -> None:
+        """Apply new request limits, requests already waiting or in flight finish within the old ones."""
+        if limits.max_concurrent_requests != self._limits.max_concurrent_requests:
+            self._request_limiter = PriorityLimiter(limits.max_concurrent_requests)
+        self._limits = limits
+        self.latency.set_bounds(limits.min_request_timeout, limits.request_timeout)
+
+    async def async_get_device_identity(self) -> DeviceIdentity:
+        """Get information identifying the unit, both endpoints requested at once within the concurrency limit."""
+        menu, unit_version = await asyncio.gather(
+            self.async_get_endpoint("menu"),
+            self.async_get_endpoint("unit_version"),
+        )
+        return DeviceIdentity(
+            mac_address=menu["mac"],
+            serial_number=unit_version["System Serial Number"],
+            mb_hw_version=unit_version["MB HW version"],
+            mb_model=unit_version["MB Model"],
+            mb_sw_version=unit_version["MB SW version"],
+            iam_sw_version=unit_version["IAM SW version"],
+        )
+
+    async def async_get_data(self, reg: Iterable[ModbusParameter]) -> dict[int, Any]:
+        """
+        Read modbus registers, coalescing nearby registers into range reads.
+
+        The breaker counts the read as a whole, a single failure or success however many requests it is sent in.
+        """
+        chunks = self.plan_requests(reg)
+        self._check_breaker()
+        try:
+            results = await asyncio.gather(*(self._async_read_spans(chunk) for chunk in chunks))
+        except SystemairApiClientRequestTooLargeError:
+            # The unit is responding, it only rejected the size of the request
+            self.breaker.record_success()
+            raise
+        except SystemairApiClientError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+        data: dict[int, Any] = {}
+        for result in results:
+            data.update(result)
+        return data
+
+    def plan_requests(self, reg: Iterable[ModbusParameter]) -> list[list[RegisterSpan]]:
+        """Return the spans read by each request, nearby registers coalesced into range reads."""
+        spans = plan_register_spans(
+            reg, max_gap=self._limits.max_register_gap, max_count=min(MAX_SPAN_REGISTERS, self._register_limit)
+        )
+        return list(self._chunk_spans(spans))
+
+    @property
+    def _register_limit(self) -> int:
+        """Return the number of registers a request may read, the configured limit or a lower one learned."""
+        if self._max_registers_per_request is None:
+            return self._limits.max_registers_per_request
+        return min(self._limits.max_registers_per_request, self._max_registers_per_request)
+
+    def _mread_url(self, spans: list[RegisterSpan]) -> str:
+        """Build the url reading the given spans."""
+        query_params = ",".join(f"%22{span.start}%22:{span.count}" for span in spans)
+        return f"http://{self._address}/mread?{{{query_params}}}"
+
+    def _chunk_spans(self, spans: list[RegisterSpan]) -> Iterator[list[RegisterSpan]]:
+        """Split spans into chunks that each fit within the request limits."""
+        chunk: list[RegisterSpan] = []
+        url_length = len(self._mread_url([]))
+        registers = 0
+        for span in spans:
+            param_length = len(f"%22{span.start}%22:{span.count},")
+            if chunk and (
+                url_length + param_length > self._limits.max_url_length
+                or registers + span.count > self._register_limit
+                or (self._max_spans_per_request is not None and len(chunk) >= self._max_spans_per_request)
+            ):
+                yield chunk
+                chunk = []
+                url_length = len(self._mread_url([]))
+                registers = 0
+            chunk.append(span)
+            url_length += param_length
+            registers += span.count
+        if chunk:
+            yield chunk
+
+    async def _async_read_spans(self, spans: list[RegisterSpan]) -> dict[int, Any]:
+        """Read a chunk of spans, splitting it further if the unit rejects it."""
+        url = self._mread_url(spans)
         LOGGER.debug("URL: %s", url)
-        return await self._api_wrapper(method="get", url=url)
+        try:
+            response = await self._api_request(method="get", url=url, size=sum(span.count for span in spans))
+        except SystemairApiClientRequestTooLargeError:
+            if len(spans) == 1:
+                return await self._async_read_split_span(spans[0])
+            half = len(spans) // 2
+            self._max_spans_per_request = min(self._max_spans_per_request or len(spans), half)
+            LOGGER.info("Unit rejected read of %s spans, limiting requests to %s spans", len(spans), half)
+            first = await self._async_read_spans(spans[:half])
+            second = await self._async_read_spans(spans[half:])
+            return {**first, **second}
+        return expand_span_response(response)
 
-    async def async_set_data(self, registry: ModbusParameter, value: int) -> Any:
-        """Write data to the API."""
-        query_params = f"%22{registry.register - 1}%22:{value}"
+    async def _async_read_split_span(self, span: RegisterSpan) -> dict[int, Any]:
+        """Read a span the unit rejected as too large in two halves."""
+        if span.count == 1:
+            msg = f"Unit rejected read of register {span.start}"
+            raise SystemairApiClientRequestTooLargeError(
+                msg,
+            )
+        half = span.count // 2
+        self._max_registers_per_request = min(self._max_registers_per_request or span.count, half)
+        LOGGER.info("Unit rejected read of %s registers, limiting requests to %s registers", span.count, half)
+        first = await self._async_read_spans([RegisterSpan(start=span.start, count=half)])
+        second = await self._async_read_spans([RegisterSpan(start=span.start + half, count=span.count - half)])
+        return {**first, **second}
+
+    async def async_set_data_batch(self, values: Mapping[ModbusParameter, int]) -> Any:
+        """Write several registers to the API in a single request."""
+        query_params = ",".join(f"%22{registry.register - 1}%22:{value}" for registry, value in values.items())
         url = f"http://{self._address}/mwrite?{{{query_params}}}"
         LOGGER.debug("URL: %s", url)
-        return await self._api_wrapper(method="get", url=url)
+        return await self._api_wrapper(method="get", url=url, size=len(values), priority=PRIORITY_WRITE)
 
-    async def _parse_response(self, response: aiohttp.ClientResponse, *, retry: bool) -> Any:
+    async def _parse_response(self, response: aiohttp.ClientResponse) -> Any:
         """Parse the response."""
-        response_body = await response.text()
-        if "MB DISCONNECTED" in response_body:
-            LOGGER.debug("Received 'MB DISCONNECTED', retrying...")
-
-            if not retry:
-                msg = "MB DISCONNECTED"
-                raise SystemairApiClientCommunicationError(
-                    msg,
-                )
-
-            await asyncio.sleep(1)
-            return None
-        if "OK" in response_body:
-            return response_body
-        return await response.json()
-
-    async def _api_wrapper(
+        # The body is read once and classified by its first byte: reads and unit info are JSON, writes answer OK
+        body = await response.read()
+        if response.status in REQUEST_TOO_LARGE_STATUSES or (
+            response.status == HTTPStatus.BAD_REQUEST and BAD_REQUEST_TOO_LARGE.search(body)
+        ):
+            msg = f"Request rejected with status {response.status}"
+            raise SystemairApiClientRequestTooLargeError(
+                msg,
+            )
+        if body.lstrip()[:1] in (b"{", b"["):
+            return orjson.loads(body)
+        if b"MB DISCONNECTED" in body:
+            msg = "MB DISCONNECTED"
+            raise SystemairApiClientDisconnectedError(
+                msg,
+            )
+        if body.lstrip().startswith(b"OK"):
+            return body.decode()
+        msg = f"Unexpected response {body[:64]!r}"
+        raise SystemairApiClientError(
+            msg,
+        )
+
+    async def _api_wrapper(  # noqa: PLR0913 Request options are keyword arguments
         self,
         method: str,
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+        *,
+        size: int = 0,
+        priority: int = PRIORITY_READ,
     ) -> Any:
-        """Get information from the API."""
-        retries = 3
+        """Get information from the API, counting the request towards the breaker."""
+        self._check_breaker()
         try:
-            for attempt in range(retries):
-                async with async_timeout.timeout(10):
-                    response = await self._session.request(
-                        method=method,
-                        url=url,
-                        headers=headers,
-                        json=data,
-                    )
-                    response = await self._parse_response(response, retry=attempt < retries - 1)
-                    if response is None:
-                        continue
-                    return response
+            response = await self._api_request(method, url, data, headers, size=size, priority=priority)
+        except SystemairApiClientRequestTooLargeError:
+            # The unit is responding, it only rejected the size of the request
+            self.breaker.record_success()
+            raise
+        except SystemairApiClientError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return response
+
+    def _check_breaker(self) -> None:
+        """Raise if requests are paused, as the unit kept failing."""
+        if not self.breaker.allow_request():
+            msg = f"Unit did not respond to recent requests, retrying in {self.breaker.recovery_time:.0f} seconds"
+            raise SystemairApiClientUnavailableError(
+                msg,
+            )
 
+    async def _api_request(  # noqa: PLR0913 Request options are keyword arguments
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        size: int = 0,
+        priority: int = PRIORITY_READ,
+    ) -> Any:
+        """Get information from the API, `size` being the number of registers read or written."""
+        try:
+            return await self._api_request_with_retries(method, url, data, headers, size, priority)
+        except SystemairApiClientRequestTooLargeError:
+            raise
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
             raise SystemairApiClientCommunicationError(
@@ -110,7 +444,7 @@ class SystemairApiClient:
             raise SystemairApiClientCommunicationError(
                 msg,
             ) from exception
-        except SystemairApiClientCommunicationError as exception:
+        except SystemairApiClientDisconnectedError as exception:
             msg = f"Received mb disconnect - {exception}"
             raise SystemairApiClientError(
                 msg,
@@ -120,3 +454,60 @@ class SystemairApiClient:
             raise SystemairApiClientError(
                 msg,
             ) from exception
+
+    async def _api_request_with_retries(  # noqa: PLR0913 Passed on from _api_request
+        self,
+        method: str,
+        url: str,
+        data: dict | None,
+        headers: dict | None,
+        size: int,
+        priority: int,
+    ) -> Any:
+        """Send a request, retrying it according to the retry policy for the kind of error."""
+        attempt = 0
+        while True:
+            try:
+                async with AsyncExitStack() as stack:
+                    await stack.enter_async_context(self._request_limiter.acquire(priority))
+                    # Only take a slot shared with other units once this unit is ready to send the request
+                    if self._limiter is not None:
+                        await stack.enter_async_context(self._limiter.acquire(priority))
+                    timeout = self.latency.timeout(size)
+                    start = time.monotonic()
+                    try:
+                        async with async_timeout.timeout(timeout):
+                            response = await self._session.request(
+                                method=method,
+                                url=url,
+                                headers=headers,
+                                json=data,
+                            )
+                            result = await self._parse_response(response)
+                    except Exception as exception:
+                        self.metrics.record_error(exception)
+                        if isinstance(exception, TimeoutError):
+                            # A hung request widens the timeout of the next ones
+                            self.latency.record(size, timeout)
+                        raise
+                    latency = time.monotonic() - start
+                    self.latency.record(size, latency)
+                    self.metrics.record(
+                        latency=latency, registers=size, sent=len(url), received=response.content_length or 0
+                    )
+                    return result
+            except (
+                TimeoutError,
+                aiohttp.ClientError,
+                socket.gaierror,
+                SystemairApiClientDisconnectedError,
+            ) as exception:
+                policy = self._limits.retry_policy(exception)
+                if policy is None or attempt + 1 >= policy.attempts:
+                    raise
+                delay = policy.delay(attempt)
+                LOGGER.debug("Request failed (%r), retrying in %.2f seconds", exception, delay)
+                attempt += 1
+                self.metrics.retries += 1
+                # Back off outside the limiters, so other requests are not held up
+                await asyncio.sleep(delay)
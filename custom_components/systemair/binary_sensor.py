@@ -44,6 +44,10 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+ENTITY_REGISTERS = tuple(
+    (entity_description, (entity_description.registry,)) for entity_description in ENTITY_DESCRIPTIONS
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
@@ -73,7 +77,7 @@ class SystemairBinarySensor(SystemairEntity, BinarySensorEntity):
         entity_description: SystemairBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary_sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, registers=(entity_description.registry,))
         self.entity_description = entity_description
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
 
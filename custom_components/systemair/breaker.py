@@ -0,0 +1,105 @@
+"""Circuit breaker for requests to a Systemair unit."""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RECOVERY_TIME,
+    BREAKER_RECOVERY_TIME,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class BreakerState(StrEnum):
+    """States of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a unit that keeps failing.
+
+    The breaker opens after a number of consecutive failures, a read sent in several requests failing once. While
+    open, requests fail right away, except for a single probe once the recovery time has passed. A successful probe
+    closes the breaker, a failed probe opens it again with a doubled recovery time, so a dead unit is probed at a
+    decaying rate.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        recovery_time: float = BREAKER_RECOVERY_TIME,
+        max_recovery_time: float = BREAKER_MAX_RECOVERY_TIME,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._initial_recovery_time = recovery_time
+        self._max_recovery_time = max_recovery_time
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.recovery_time = recovery_time
+        self.next_probe = 0.0
+        self._listeners: list[Callable[[], None]] = []
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call the listener when the state changes, returning a function removing it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _set_state(self, state: BreakerState) -> None:
+        """Change the state and notify listeners."""
+        if state == self.state:
+            return
+        self.state = state
+        for listener in list(self._listeners):
+            listener()
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether requests are currently failed without being sent."""
+        return self.state != BreakerState.CLOSED and time.monotonic() < self.next_probe
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent, letting a single probe through once the recovery time passed."""
+        if self.state == BreakerState.CLOSED:
+            return True
+        now = time.monotonic()
+        if now < self.next_probe:
+            return False
+        # Another probe is let through if the previous one never completed
+        self._set_state(BreakerState.HALF_OPEN)
+        self.next_probe = now + self.recovery_time
+        LOGGER.debug("Probing unit after %s seconds", self.recovery_time)
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self.state != BreakerState.CLOSED:
+            LOGGER.info("Unit is responding again, resuming requests")
+        self._set_state(BreakerState.CLOSED)
+        self.failures = 0
+        self.recovery_time = self._initial_recovery_time
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker when the unit keeps failing."""
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN:
+            self.recovery_time = min(self.recovery_time * 2, self._max_recovery_time)
+        elif self.state == BreakerState.OPEN or self.failures < self._failure_threshold:
+            return
+        else:
+            LOGGER.warning(
+                "Unit failed %s requests in a row, pausing requests for %s seconds", self.failures, self.recovery_time
+            )
+        self.next_probe = time.monotonic() + self.recovery_time
+        self._set_state(BreakerState.OPEN)
@@ -0,0 +1,79 @@
+"""Creates the client for the transport configured for a Systemair unit."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import SystemairApiClient, SystemairApiClientLimits
+from .const import (
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REGISTERS_PER_REQUEST,
+    CONF_REQUEST_TIMEOUT,
+    CONF_TRANSPORT,
+    CONF_UNIT_ID,
+    DATA_DEVICE_IDENTITIES,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REGISTERS_PER_REQUEST,
+    DEFAULT_MODBUS_PORT,
+    DEFAULT_MODBUS_UNIT_ID,
+    REQUEST_TIMEOUT,
+    TRANSPORT_IAM,
+    TRANSPORT_MODBUS_TCP,
+)
+from .modbus_tcp import SystemairModbusTcpClient
+from .scheduler import async_get_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import DeviceIdentity, SystemairTransport
+
+
+def create_limits(options: Mapping[str, Any]) -> SystemairApiClientLimits:
+    """Create the request limits set in the config entry options."""
+    return SystemairApiClientLimits(
+        max_registers_per_request=options.get(CONF_MAX_REGISTERS_PER_REQUEST, DEFAULT_MAX_REGISTERS_PER_REQUEST),
+        max_concurrent_requests=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+        request_timeout=options.get(CONF_REQUEST_TIMEOUT, REQUEST_TIMEOUT),
+    )
+
+
+def create_client(
+    hass: HomeAssistant,
+    data: Mapping[str, Any],
+    options: Mapping[str, Any],
+) -> SystemairTransport:
+    """Create a client for the transport selected in the config entry data."""
+    if data.get(CONF_TRANSPORT, TRANSPORT_IAM) == TRANSPORT_MODBUS_TCP:
+        return SystemairModbusTcpClient(
+            host=data[CONF_IP_ADDRESS],
+            port=data.get(CONF_PORT, DEFAULT_MODBUS_PORT),
+            unit_id=data.get(CONF_UNIT_ID, DEFAULT_MODBUS_UNIT_ID),
+            limits=create_limits(options),
+            limiter=async_get_scheduler(hass).limiter,
+        )
+
+    return SystemairApiClient(
+        address=data[CONF_IP_ADDRESS],
+        session=async_get_clientsession(hass),
+        limits=create_limits(options),
+        limiter=async_get_scheduler(hass).limiter,
+    )
+
+
+async def async_get_device_identity(
+    hass: HomeAssistant,
+    client: SystemairTransport,
+    *,
+    refresh: bool = False,
+) -> DeviceIdentity:
+    """Return the identity of the unit, cached per address and shared by the config flow and the coordinators."""
+    identities: dict[str, DeviceIdentity] = hass.data.setdefault(DATA_DEVICE_IDENTITIES, {})
+    if refresh or (identity := identities.get(client.address)) is None:
+        identity = identities[client.address] = await client.async_get_device_identity()
+    return identity
@@ -1,10 +1,12 @@
 """Systemair integration."""
 
 import asyncio.exceptions
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.climate import (
     ClimateEntity,
+    ClimateEntityDescription,
 )
 from homeassistant.components.climate.const import (
     FAN_HIGH,
@@ -33,7 +35,7 @@ from .const import (
 )
 from .coordinator import SystemairDataUpdateCoordinator
 from .entity import SystemairEntity
-from .modbus import parameter_map
+from .modbus import ModbusParameter, parameter_map
 
 PRESET_MODE_TO_VALUE_MAP = {
     PRESET_MODE_MANUAL: 2,
@@ -55,13 +57,42 @@ FAN_MODE_TO_VALUE_MAP = {
 VALUE_TO_FAN_MODE_MAP = {value: key for key, value in FAN_MODE_TO_VALUE_MAP.items()}
 
 
+@dataclass(kw_only=True, frozen=True)
+class SystemairClimateEntityDescription(ClimateEntityDescription):
+    """Describes a Systemair climate entity."""
+
+    registers: tuple[ModbusParameter, ...]
+
+
+ENTITY_DESCRIPTION = SystemairClimateEntityDescription(
+    key="climate",
+    translation_key="saveconnect",
+    registers=tuple(
+        parameter_map[short]
+        for short in [
+            "REG_FUNCTION_ACTIVE_HEATER",
+            "REG_FUNCTION_ACTIVE_COOLER",
+            "REG_OUTPUT_TRIAC",
+            "REG_OUTPUT_Y3_DIGITAL",
+            "REG_SENSOR_RHS_PDM",
+            "REG_SENSOR_SAT",
+            "REG_TC_SP",
+            "REG_USERMODE_MODE",
+            "REG_USERMODE_MANUAL_AIRFLOW_LEVEL_SAF",
+        ]
+    ),
+)
+
+ENTITY_REGISTERS = ((ENTITY_DESCRIPTION, ENTITY_DESCRIPTION.registers),)
+
+
 async def async_setup_entry(
     _hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Systemair unit."""
-    async_add_entities([SystemairClimateEntity(config_entry.runtime_data.coordinator)])
+    async_add_entities([SystemairClimateEntity(config_entry.runtime_data.coordinator, ENTITY_DESCRIPTION)])
 
 
 class SystemairClimateEntity(SystemairEntity, ClimateEntity):
@@ -96,21 +127,32 @@ class SystemairClimateEntity(SystemairEntity, ClimateEntity):
     _attr_min_temp = MIN_TEMP
     _enable_turn_on_off_backwards_compatibility = False
 
-    def __init__(self, coordinator: SystemairDataUpdateCoordinator) -> None:
+    entity_description: SystemairClimateEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SystemairDataUpdateCoordinator,
+        entity_description: SystemairClimateEntityDescription,
+    ) -> None:
         """Initialize the Systemair unit."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-climate"
-        self._attr_translation_key = "saveconnect"
+        super().__init__(coordinator, registers=entity_description.registers)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
 
+    @property
+    def hvac_modes(self) -> list[HVACMode]:
+        """Return the hvac modes of the unit, known once its functions are read."""
         heater = self.coordinator.get_modbus_data(parameter_map["REG_FUNCTION_ACTIVE_HEATER"])
         cooler = self.coordinator.get_modbus_data(parameter_map["REG_FUNCTION_ACTIVE_COOLER"])
 
-        self._attr_hvac_modes = [HVACMode.FAN_ONLY]
+        hvac_modes = [HVACMode.FAN_ONLY]
         if heater:
-            self._attr_hvac_modes.append(HVACMode.HEAT)
+            hvac_modes.append(HVACMode.HEAT)
 
         if cooler:
-            self._attr_hvac_modes.append(HVACMode.COOL)
+            hvac_modes.append(HVACMode.COOL)
+
+        return hvac_modes
 
     @property
     def hvac_action(self) -> HVACAction | None:
@@ -149,8 +191,6 @@ class SystemairClimateEntity(SystemairEntity, ClimateEntity):
             await self.coordinator.set_modbus_data(parameter_map["REG_TC_SP"], temperature)
         except (asyncio.exceptions.TimeoutError, ConnectionError, DecodingError) as exc:
             raise HomeAssistantError from exc
-        finally:
-            await self.coordinator.async_refresh()
 
     @property
     def preset_mode(self) -> str:
@@ -167,12 +207,13 @@ class SystemairClimateEntity(SystemairEntity, ClimateEntity):
         ventilation_mode = PRESET_MODE_TO_VALUE_MAP[preset_mode]
 
         try:
-            await self.coordinator.set_modbus_data(parameter_map["REG_USERMODE_HMI_CHANGE_REQUEST"], ventilation_mode)
+            await self.coordinator.set_modbus_data(
+                parameter_map["REG_USERMODE_HMI_CHANGE_REQUEST"],
+                ventilation_mode,
+                optimistic={parameter_map["REG_USERMODE_MODE"]: ventilation_mode - 1},
+            )
         except (asyncio.exceptions.TimeoutError, ConnectionError, DecodingError) as exc:
             raise HomeAssistantError from exc
-        finally:
-            await asyncio.sleep(2)
-            await self.coordinator.async_refresh()
 
     @property
     def hvac_mode(self) -> HVACMode:
@@ -206,5 +247,3 @@ class SystemairClimateEntity(SystemairEntity, ClimateEntity):
             await self.coordinator.set_modbus_data(parameter_map["REG_USERMODE_MANUAL_AIRFLOW_LEVEL_SAF"], mode)
         except (asyncio.exceptions.TimeoutError, ConnectionError) as exc:
             raise HomeAssistantError from exc
-        finally:
-            await self.coordinator.async_refresh()
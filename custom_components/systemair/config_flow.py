@@ -4,16 +4,55 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
+    DeviceIdentity,
     SystemairApiClient,
     SystemairApiClientCommunicationError,
     SystemairApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .client import async_get_device_identity
+from .const import (
+    CONF_ALARM_POLL_INTERVAL,
+    CONF_CONFIG_POLL_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REGISTERS_PER_REQUEST,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_READ_ALARMS,
+    CONF_READ_BACK_TIMEOUT,
+    CONF_READ_CONFIG,
+    CONF_REQUEST_TIMEOUT,
+    CONF_TRANSPORT,
+    CONF_UNIT_ID,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REGISTERS_PER_REQUEST,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_MODBUS_PORT,
+    DEFAULT_MODBUS_UNIT_ID,
+    DOMAIN,
+    LOGGER,
+    POLL_INTERVAL_MEDIUM,
+    POLL_INTERVAL_SLOW,
+    READ_BACK_TIMEOUT,
+    REQUEST_TIMEOUT,
+    TRANSPORT_IAM,
+    TRANSPORT_MODBUS_TCP,
+)
+from .modbus_tcp import SystemairModbusTcpClient
+
+
+def number_selector(maximum: int, unit_of_measurement: str | None = None) -> selector.NumberSelector:
+    """Return a selector for a whole number from 1 up to the maximum."""
+    config = selector.NumberSelectorConfig(min=1, max=maximum, mode=selector.NumberSelectorMode.BOX)
+    if unit_of_measurement is not None:
+        config["unit_of_measurement"] = unit_of_measurement
+    return selector.NumberSelector(config)
 
 
 class SystemairFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,15 +60,33 @@ class SystemairFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SystemairOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return SystemairOptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self,
-        user_input: dict | None = None,
+        user_input: dict | None = None,  # noqa: ARG002 Unused method argument: `user_input`
     ) -> data_entry_flow.FlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=[TRANSPORT_IAM, TRANSPORT_MODBUS_TCP],
+        )
+
+    async def async_step_iam(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Handle a unit connected through the SAVE Connect web interface."""
         _errors = {}
         if user_input is not None:
             try:
-                data = await self._test_connection(
+                identity = await self._test_connection(
                     address=user_input[CONF_IP_ADDRESS],
                 )
             except SystemairApiClientCommunicationError as exception:
@@ -39,16 +96,16 @@ class SystemairFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(data["mac_address"])
+                await self.async_set_unique_id(identity.mac_address)
                 self._abort_if_unique_id_configured()
 
                 return self.async_create_entry(
-                    title=data["model"],
-                    data=user_input,
+                    title=identity.mb_model,
+                    data={**user_input, CONF_TRANSPORT: TRANSPORT_IAM},
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id=TRANSPORT_IAM,
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -63,17 +120,124 @@ class SystemairFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_connection(self, address: str) -> dict[str, str]:
-        """Validate credentials."""
+    async def async_step_modbus_tcp(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Handle a unit connected over Modbus TCP."""
+        _errors = {}
+        if user_input is not None:
+            user_input[CONF_PORT] = int(user_input[CONF_PORT])
+            user_input[CONF_UNIT_ID] = int(user_input[CONF_UNIT_ID])
+            client = SystemairModbusTcpClient(
+                host=user_input[CONF_IP_ADDRESS],
+                port=user_input[CONF_PORT],
+                unit_id=user_input[CONF_UNIT_ID],
+            )
+            try:
+                await client.async_test_connection()
+            except SystemairApiClientCommunicationError as exception:
+                LOGGER.error(exception)
+                _errors["base"] = "connection"
+            except SystemairApiClientError as exception:
+                LOGGER.exception(exception)
+                _errors["base"] = "unknown"
+            else:
+                await self.async_set_unique_id(
+                    f"{user_input[CONF_IP_ADDRESS]}:{user_input[CONF_PORT]}:{user_input[CONF_UNIT_ID]}"
+                )
+                self._abort_if_unique_id_configured()
+
+                return self.async_create_entry(
+                    title=f"Systemair {user_input[CONF_IP_ADDRESS]}",
+                    data={**user_input, CONF_TRANSPORT: TRANSPORT_MODBUS_TCP},
+                )
+            finally:
+                await client.async_close()
+
+        return self.async_show_form(
+            step_id=TRANSPORT_MODBUS_TCP,
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_IP_ADDRESS): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        )
+                    ),
+                    vol.Required(CONF_PORT, default=DEFAULT_MODBUS_PORT): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=65535,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(CONF_UNIT_ID, default=DEFAULT_MODBUS_UNIT_ID): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=247,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def _test_connection(self, address: str) -> DeviceIdentity:
+        """Validate credentials, the identity is cached for the setup of the config entry."""
         client = SystemairApiClient(
             address=address,
             session=async_create_clientsession(self.hass),
         )
-        menu = await client.async_get_endpoint("menu")
-        unit_version = await client.async_get_endpoint("unit_version")
+        return await async_get_device_identity(self.hass, client, refresh=True)
+
+
+class SystemairOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Systemair."""
 
-        response = {}
-        response["mac_address"] = menu["mac"]
-        response["model"] = unit_version["MB Model"]
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the options, applied to the running unit without reloading it."""
+        _errors = {}
+        if user_input is not None:
+            user_input = {key: value if isinstance(value, bool) else int(value) for key, value in user_input.items()}
+            if user_input[CONF_MIN_UPDATE_INTERVAL] > user_input[CONF_MAX_UPDATE_INTERVAL]:
+                _errors["base"] = "update_interval_bounds"
+            else:
+                return self.async_create_entry(data={**self.config_entry.options, **user_input})
 
-        return response
+        options = self.config_entry.options
+        fields: dict[str, tuple[float, selector.NumberSelector]] = {
+            CONF_MIN_UPDATE_INTERVAL: (DEFAULT_MIN_UPDATE_INTERVAL, number_selector(3600, "s")),
+            CONF_MAX_UPDATE_INTERVAL: (DEFAULT_MAX_UPDATE_INTERVAL, number_selector(3600, "s")),
+            CONF_ALARM_POLL_INTERVAL: (POLL_INTERVAL_MEDIUM.total_seconds(), number_selector(86400, "s")),
+            CONF_CONFIG_POLL_INTERVAL: (POLL_INTERVAL_SLOW.total_seconds(), number_selector(86400, "s")),
+            CONF_READ_BACK_TIMEOUT: (READ_BACK_TIMEOUT, number_selector(60, "s")),
+        }
+        # Requests over Modbus TCP are sent one at a time and are not batched by size
+        if self.config_entry.data.get(CONF_TRANSPORT, TRANSPORT_IAM) == TRANSPORT_IAM:
+            fields |= {
+                CONF_MAX_REGISTERS_PER_REQUEST: (DEFAULT_MAX_REGISTERS_PER_REQUEST, number_selector(1000)),
+                CONF_MAX_CONCURRENT_REQUESTS: (DEFAULT_MAX_CONCURRENT_REQUESTS, number_selector(8)),
+                CONF_REQUEST_TIMEOUT: (REQUEST_TIMEOUT, number_selector(60, "s")),
+            }
+        schema = {
+            vol.Required(key, default=options.get(key, default)): field_selector
+            for key, (default, field_selector) in fields.items()
+        }
+        # Groups of registers that can be turned off
+        schema |= {
+            vol.Required(key, default=options.get(key, True)): selector.BooleanSelector()
+            for key in (CONF_READ_ALARMS, CONF_READ_CONFIG)
+        }
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+            errors=_errors,
+        )
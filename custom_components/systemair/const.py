@@ -1,12 +1,115 @@
 """Constants for Systemair."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "systemair"
+# Identities of the units, by address, shared by the config flow and all config entries
+DATA_DEVICE_IDENTITIES = f"{DOMAIN}_device_identities"
+DATA_STORES = f"{DOMAIN}_stores"
 ATTRIBUTION = "Data provided by Systemair SAVE Connect."
 
+CONF_TRANSPORT = "transport"
+CONF_UNIT_ID = "unit_id"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_ALARM_POLL_INTERVAL = "alarm_poll_interval"
+CONF_CONFIG_POLL_INTERVAL = "config_poll_interval"
+CONF_READ_ALARMS = "read_alarms"
+CONF_READ_CONFIG = "read_config"
+CONF_MAX_REGISTERS_PER_REQUEST = "max_registers_per_request"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_READ_BACK_TIMEOUT = "read_back_timeout"
+
+# Ways of communicating with the unit, through the SAVE Connect IAM web interface or directly over Modbus TCP
+TRANSPORT_IAM = "iam"
+TRANSPORT_MODBUS_TCP = "modbus_tcp"
+
+# What is known about a unit is stored per config entry, so a restart does not wait for the unit
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+# Register values are stored at most this often, and not shown at startup once older than the max age
+SNAPSHOT_SAVE_INTERVAL = 300
+SNAPSHOT_MAX_AGE = timedelta(days=1)
+
+DEFAULT_MODBUS_PORT = 502
+DEFAULT_MODBUS_UNIT_ID = 1
+MODBUS_TIMEOUT = 10
+
+UPDATE_INTERVAL = timedelta(seconds=10)
+# Bounds of the update interval, which shortens while the unit is changing and lengthens while it is stable
+DEFAULT_MIN_UPDATE_INTERVAL = 5
+DEFAULT_MAX_UPDATE_INTERVAL = 60
+# Factors the update interval grows by while values are stable, and while the unit is failing or slow
+UPDATE_INTERVAL_GROWTH = 1.5
+UPDATE_INTERVAL_BACKOFF = 2.0
+# Updates at the shortest interval after a write or a change in the state of the unit
+FAST_UPDATES_AFTER_CHANGE = 3
+# An update taking longer than this many seconds counts as slow
+SLOW_UPDATE_DURATION = 2.0
+# Poll intervals for registers that change slower than the update interval
+POLL_INTERVAL_MEDIUM = timedelta(minutes=1)
+POLL_INTERVAL_SLOW = timedelta(minutes=5)
+
+# Unused registers allowed between two registers before a range read is split
+DEFAULT_MAX_REGISTER_GAP = 8
+
+# Limits for a single mread request, larger reads are split into several requests
+DEFAULT_MAX_URL_LENGTH = 1024
+DEFAULT_MAX_REGISTERS_PER_REQUEST = 250
+# Set to 1 for units that cannot handle parallel requests
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+
+# Bounds of the seconds a single request to the unit may take
+REQUEST_TIMEOUT = 10.0
+MIN_REQUEST_TIMEOUT = 1.0
+
+# Timeouts are derived from a high percentile of the latency of recent requests of similar size
+LATENCY_WINDOW = 50
+LATENCY_MIN_SAMPLES = 10
+LATENCY_PERCENTILE = 0.99
+LATENCY_TIMEOUT_FACTOR = 2.0
+LATENCY_TIMEOUT_MARGIN = 0.5
+
+# Upper bounds in seconds of the buckets of the request latency histogram, the last bucket holds slower requests
+REQUEST_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Poll cycles kept for the diagnostics
+POLL_HISTORY_SIZE = 20
+
+# Retries of failed requests, with an exponential backoff and full jitter between attempts, per kind of error
+RETRY_DISCONNECTED_ATTEMPTS = 3
+RETRY_DISCONNECTED_BASE_DELAY = 0.5
+RETRY_DISCONNECTED_MAX_DELAY = 4.0
+RETRY_TIMEOUT_ATTEMPTS = 2
+RETRY_TIMEOUT_BASE_DELAY = 1.0
+RETRY_TIMEOUT_MAX_DELAY = 8.0
+RETRY_CONNECTION_ATTEMPTS = 2
+RETRY_CONNECTION_BASE_DELAY = 0.5
+RETRY_CONNECTION_MAX_DELAY = 4.0
+
+# Failed requests in a row before requests to the unit are paused, and the pause before probing it again
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RECOVERY_TIME = 30.0
+BREAKER_MAX_RECOVERY_TIME = 600.0
+
+# Requests in flight to all units together. Requests waiting for a slot of their unit or of all units are sent by
+# priority, a lower value going first
+FLEET_MAX_CONCURRENT_REQUESTS = 16
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+
+# Writes issued within this many seconds are sent to the unit in a single request
+WRITE_COALESCE_DELAY = 0.25
+# Written registers are read back with a growing delay until the unit reflects the write or the timeout passes,
+# the timeout being an option
+READ_BACK_INITIAL_DELAY = 0.25
+READ_BACK_MAX_DELAY = 1.0
+READ_BACK_TIMEOUT = 5.0
+
 MAX_TEMP = 30
 MIN_TEMP = 12
 
@@ -2,24 +2,95 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import time
+from collections import deque
 from datetime import timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_at
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     SystemairApiClientError,
 )
-from .const import DOMAIN, LOGGER
-from .modbus import IntegerType, parameter_map
+from .client import async_get_device_identity
+from .const import (
+    CONF_ALARM_POLL_INTERVAL,
+    CONF_CONFIG_POLL_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_READ_ALARMS,
+    CONF_READ_BACK_TIMEOUT,
+    CONF_READ_CONFIG,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+    FAST_UPDATES_AFTER_CHANGE,
+    LOGGER,
+    POLL_HISTORY_SIZE,
+    POLL_INTERVAL_MEDIUM,
+    POLL_INTERVAL_SLOW,
+    READ_BACK_INITIAL_DELAY,
+    READ_BACK_MAX_DELAY,
+    READ_BACK_TIMEOUT,
+    SLOW_UPDATE_DURATION,
+    UPDATE_INTERVAL,
+    UPDATE_INTERVAL_BACKOFF,
+    UPDATE_INTERVAL_GROWTH,
+    WRITE_COALESCE_DELAY,
+)
+from .metrics import PollCycle
+from .modbus import (
+    RegisterDecoder,
+    alarm_parameters,
+    config_parameters,
+    function_parameters,
+    operation_parameters,
+    parameter_map,
+    register_map,
+)
+from .scheduler import SystemairScheduler, async_get_scheduler
+from .store import async_get_store
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
 
     from .data import SystemairConfigEntry
     from .modbus import ModbusParameter
 
+# Registers whose changes show the unit is in transition, e.g. changing user mode or defrosting
+ACTIVITY_PARAMETERS = (
+    *(param for short, param in operation_parameters.items() if not short.startswith("REG_SENSOR_RPM")),
+    parameter_map["REG_ALARM_DEFROSTING_ALARM"],
+    *function_parameters.values(),
+)
+
+# Registers read less often than every update, by the option setting their poll interval and its default.
+# Registers not listed here are read on every update, as are those showing activity, so a transition is seen right away
+POLL_INTERVAL_GROUPS: dict[str, tuple[tuple[ModbusParameter, ...], timedelta]] = {
+    option: (tuple(param for param in params if param not in ACTIVITY_PARAMETERS), default)
+    for option, params, default in (
+        (CONF_CONFIG_POLL_INTERVAL, config_parameters.values(), POLL_INTERVAL_SLOW),
+        (CONF_ALARM_POLL_INTERVAL, alarm_parameters.values(), POLL_INTERVAL_MEDIUM),
+    )
+}
+
+# Registers not read at all while the option reading them is turned off
+REGISTER_GROUPS: dict[str, tuple[ModbusParameter, ...]] = {
+    CONF_READ_CONFIG: tuple(config_parameters.values()),
+    CONF_READ_ALARMS: tuple(alarm_parameters.values()),
+}
+
 
 class InvalidBooleanValueError(HomeAssistantError):
     """Exception raised for invalid boolean values."""
@@ -29,68 +100,219 @@ class InvalidBooleanValueError(HomeAssistantError):
         super().__init__("Value must be a boolean")
 
 
+class UnitUnavailableError(HomeAssistantError):
+    """Exception raised when writing to a unit that stopped responding."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        super().__init__("Unit is not responding, try again later")
+
+
+class WriteFailedError(HomeAssistantError):
+    """Exception raised when sending a write to the unit failed."""
+
+    def __init__(self, config_entry: SystemairConfigEntry, exception: SystemairApiClientError) -> None:
+        """Initialize."""
+        super().__init__(
+            translation_domain=DOMAIN,
+            translation_key="write_failed",
+            translation_placeholders={
+                "config_entry": config_entry.title,
+                "error": str(exception),
+            },
+        )
+
+
+class WriteNotAppliedError(HomeAssistantError):
+    """Exception raised when the unit did not apply written values."""
+
+    def __init__(self, keys: Iterable[int]) -> None:
+        """Initialize."""
+        super().__init__(f"Unit did not apply the value written to register {', '.join(map(str, keys))}")
+
+
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class SystemairDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
     config_entry: SystemairConfigEntry
-    modbus_parameters: list[ModbusParameter]
+    # Registered parameters in registration order, used as an ordered set
+    modbus_parameters: dict[ModbusParameter, None]
+    poll_intervals: dict[ModbusParameter, timedelta]
 
     def __init__(
         self,
         hass: HomeAssistant,
     ) -> None:
         """Initialize."""
+        # Raw values shown until the unit confirms a write, keyed like the data. Set first, as the data setter uses it
+        self._optimistic: dict[int, int] = {}
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=10),
+            # Updates are scheduled by the coordinator itself, in the update slot of the unit
+            update_interval=None,
+            always_update=False,
         )
-        self.modbus_parameters = []
+        # Interval between updates, adapted to how the unit behaves
+        self.interval = UPDATE_INTERVAL
+        self._unsub_update: CALLBACK_TYPE | None = None
+        self._updates_stopped = False
+        self.modbus_parameters = {}
+        self._decoders: dict[int, RegisterDecoder] = {}
+        self._next_poll: dict[ModbusParameter, float] = {}
+        # Register keys changed by the last update, None when every listener subscribed to registers must be notified
+        self._changed_keys: frozenset[int] | None = None
+        # Writes waiting to be sent together, and the task that will send them
+        self._pending_writes: dict[ModbusParameter, int] = {}
+        self._pending_optimistic: dict[int, int] = {}
+        self._write_task: asyncio.Task[None] | None = None
+        # Optimistic values whose write could not be read back, confirmed by the next update instead
+        self._unconfirmed: dict[int, int] = {}
+        # When registers were last read back after a write, newer than what updates started before then read
+        self._read_back: dict[int, float] = {}
+        # Registers of turned off groups, which are not read
+        self.disabled_parameters: frozenset[ModbusParameter] = frozenset()
+        self.async_apply_options()
+        self._activity_keys = self.register_keys(ACTIVITY_PARAMETERS)
+        # Updates left at the shortest interval
+        self._fast_updates = 0
+        self.store = async_get_store(hass, self.config_entry.entry_id)
+        # When the data was last read from the unit, older than the startup when restored from the store
+        self.data_updated: datetime | None = None
+        # Latest updates, newest last, for the diagnostics
+        self.poll_history: deque[PollCycle] = deque(maxlen=POLL_HISTORY_SIZE)
+        scheduler = async_get_scheduler(hass)
+        self._phase = scheduler.async_register(self.config_entry.entry_id)
+        self.config_entry.async_on_unload(partial(scheduler.async_unregister, self.config_entry.entry_id))
+
+    @property
+    def data(self) -> Any:
+        """Return the latest data, keyed by register address."""
+        return self._data
+
+    @data.setter
+    def data(self, data: Any) -> None:
+        """Set the latest data, starting a new generation of decoded values."""
+        self._data = data
+        self._invalidate_decoded()
+
+    def _invalidate_decoded(self) -> None:
+        """Start a new generation of decoded values, from the data with optimistic values applied."""
+        self._decoded: dict[int, float] = {}
+        self._decode_data = {**(self._data or {}), **self._optimistic} if self._optimistic else self._data or {}
 
     def register_modbus_parameters(self, modbus_parameter: ModbusParameter) -> None:
         """Register a list of Modbus parameters to be updated."""
-        if modbus_parameter not in self.modbus_parameters:
-            self.modbus_parameters.append(modbus_parameter)
+        if modbus_parameter in self.modbus_parameters:
+            return
 
-        if modbus_parameter.combine_with_32_bit:
-            combine_with = next(
-                (param for param in parameter_map.values() if param.register == modbus_parameter.combine_with_32_bit),
-                None,
-            )
+        self.modbus_parameters[modbus_parameter] = None
+        self._decoders[modbus_parameter.register] = RegisterDecoder.from_parameter(modbus_parameter)
+
+        if modbus_parameter.combine_with_32_bit and (
+            combine_with := register_map.get(modbus_parameter.combine_with_32_bit)
+        ):
+            self.register_modbus_parameters(combine_with)
 
-            if combine_with and combine_with not in self.modbus_parameters:
-                self.modbus_parameters.append(combine_with)
+    @staticmethod
+    def register_keys(registers: Iterable[ModbusParameter]) -> frozenset[int]:
+        """Return the data keys the given registers are decoded from."""
+        keys = set()
+        for register in registers:
+            keys.add(register.register - 1)
+            if register.combine_with_32_bit:
+                keys.add(register.combine_with_32_bit - 1)
+        return frozenset(keys)
+
+    def _changed_data_keys(self, data: Mapping[int, Any]) -> frozenset[int] | None:
+        """Return the keys in data that differ from the current data, None if every listener must be notified."""
+        # Entities only need to be notified about changed registers, unless they are recovering from a failure
+        if self.data is None or not self.last_update_success:
+            return None
+        return frozenset(key for key, value in data.items() if self.data.get(key) != value)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners subscribed to changed registers, or to any register if unknown."""
+        changed_keys, self._changed_keys = self._changed_keys, None
+        if not self.last_update_success:
+            changed_keys = None
+
+        for update_callback, context in list(self._listeners.values()):
+            # Listeners not subscribed to registers are updated when a refresh finishes
+            if context is not None and (changed_keys is None or not changed_keys.isdisjoint(context)):
+                update_callback()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """
+        Schedule the next update, and update listeners not subscribed to registers after every refresh.
+
+        Listeners not subscribed to registers, e.g. of the request metrics, are otherwise only updated when the data
+        changed, not while the unit is stable or keeps failing.
+        """
+        self._async_schedule_update()
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
 
     def get_modbus_data(self, register: ModbusParameter) -> float:
         """Get the data for a Modbus register."""
-        self.register_modbus_parameters(register)
-        value = self.data.get(str(register.register - 1))
+        address = register.register
+        if (value := self._decoded.get(address)) is not None:
+            return value
 
-        if value is None:
-            return 0
-        if register.boolean:
-            return value != 0
-        value = int(value)
+        if address not in self._decoders:
+            self.register_modbus_parameters(register)
+        value = self._decoded[address] = self._decoders[address].decode(self._decode_data)
+        return value
 
-        if register.combine_with_32_bit:
-            high = self.data.get(str(register.combine_with_32_bit - 1))
-            if high is None:
-                return 0
-            value += int(high) << 16
+    @callback
+    def _async_notify_optimistic(self, keys: Iterable[int]) -> None:
+        """Notify listeners of registers whose optimistic values changed."""
+        self._invalidate_decoded()
+        self._changed_keys = frozenset(keys)
+        self.async_update_listeners()
 
-        if register.sig == IntegerType.INT and value > (1 << 15):
-            value = -(65536 - value)
-        return value / (register.scale_factor or 1)
+    @callback
+    def _async_set_optimistic(self, values: Mapping[int, int]) -> None:
+        """Show optimistic values until the unit confirms them."""
+        self._optimistic.update(values)
+        self._async_notify_optimistic(values)
 
-    async def set_modbus_data(self, register: ModbusParameter, value: Any) -> None:
-        """Set the data for a Modbus register."""
+    @callback
+    def _async_reconcile_optimistic(self, expected: Mapping[int, int], data: Mapping[int, Any]) -> list[int]:
+        """Drop optimistic values covered by data read from the unit, returning the keys the unit rejected."""
+        rejected = []
+        for key, value in expected.items():
+            if key not in data:
+                continue
+            if self._optimistic.get(key) == value:
+                del self._optimistic[key]
+            if data[key] != value:
+                rejected.append(key)
+
+        if rejected:
+            LOGGER.error("Unit did not apply the value written to register %s", ", ".join(map(str, rejected)))
+        return rejected
+
+    @callback
+    def _async_rollback_optimistic(self, values: Mapping[int, int]) -> None:
+        """Drop optimistic values of writes that failed."""
+        for key, value in values.items():
+            if self._optimistic.get(key) == value:
+                del self._optimistic[key]
+        self._async_notify_optimistic(values)
+
+    @staticmethod
+    def _encode_modbus_data(register: ModbusParameter, value: Any) -> int:
+        """Encode a value to the raw value written to a Modbus register."""
         if register.boolean:
             if not isinstance(value, bool):
                 raise InvalidBooleanValueError
-            value = 1 if value else 0
-            return await self.config_entry.runtime_data.client.async_set_data(register, value)
+            return 1 if value else 0
 
         value = int(value)
         value = value * (register.scale_factor or 1)
@@ -98,28 +320,398 @@ class SystemairDataUpdateCoordinator(DataUpdateCoordinator):
             value = register.min_value
         if register.max_value is not None and value > register.max_value:
             value = register.max_value
+        return value
+
+    async def set_modbus_data(
+        self,
+        register: ModbusParameter,
+        value: Any,
+        *,
+        optimistic: Mapping[ModbusParameter, Any] | None = None,
+    ) -> None:
+        """Set the data for a Modbus register."""
+        await self.set_modbus_data_batch({register: value}, optimistic=optimistic)
+
+    async def set_modbus_data_batch(
+        self,
+        values: Mapping[ModbusParameter, Any],
+        *,
+        optimistic: Mapping[ModbusParameter, Any] | None = None,
+    ) -> None:
+        """
+        Set the data for several Modbus registers.
+
+        The written values are shown right away, until the unit confirms or rejects them. Registers that
+        only request a change of other registers are not shown, pass the expected values of the changed
+        registers as `optimistic` instead.
+
+        Writes issued within a short window are coalesced into a single request. The call returns once
+        the request containing these writes has completed. Writes fail right away while requests to the
+        unit are paused, as it kept failing.
+        """
+        if self.config_entry.runtime_data.client.breaker.is_open:
+            raise UnitUnavailableError
 
-        return await self.config_entry.runtime_data.client.async_set_data(register, value)
+        encoded = {register: self._encode_modbus_data(register, value) for register, value in values.items()}
+        expected = {register.register - 1: value for register, value in encoded.items() if not register.dependents}
+        for register, value in (optimistic or {}).items():
+            expected[register.register - 1] = self._encode_modbus_data(register, value)
+
+        self._pending_writes.update(encoded)
+        self._pending_optimistic.update(expected)
+        self._async_set_optimistic(expected)
+        if self._write_task is None:
+            self._write_task = self.config_entry.async_create_task(
+                self.hass,
+                self._async_flush_writes(),
+                f"{DOMAIN} write {self.config_entry.entry_id}",
+            )
+        try:
+            await asyncio.shield(self._write_task)
+        except SystemairApiClientError as exception:
+            raise WriteFailedError(self.config_entry, exception) from exception
+
+    async def _async_flush_writes(self) -> None:
+        """Send all pending writes once the coalescing window has passed, then read them back."""
+        await asyncio.sleep(WRITE_COALESCE_DELAY)
+        # Writes issued from here on go into the next request
+        self._write_task = None
+        writes, self._pending_writes = self._pending_writes, {}
+        expected, self._pending_optimistic = self._pending_optimistic, {}
+        before = self.data or {}
+        try:
+            await self.config_entry.runtime_data.client.async_set_data_batch(writes)
+        except SystemairApiClientError:
+            self._async_rollback_optimistic(expected)
+            raise
+        self._async_update_faster()
+
+        try:
+            data = await self._async_read_back(writes, before)
+        except SystemairApiClientError as exception:
+            LOGGER.debug("Reading back written registers failed, refreshing all data: %s", exception)
+            self._unconfirmed.update(expected)
+            for register in writes:
+                # Read the register again on the next update, regardless of its poll interval
+                self._next_poll.pop(register, None)
+            await self.async_request_refresh()
+            return
+
+        rejected = self._async_reconcile_optimistic(expected, data)
+        self._changed_keys = self._changed_data_keys(data)
+        if self._changed_keys is not None and rejected:
+            self._changed_keys |= frozenset(rejected)
+        self.data = {**(self.data or {}), **data}
+        done = time.monotonic()
+        self._read_back.update(dict.fromkeys(data, done))
+        self.store.async_set_snapshot(self.data, self.data_updated or dt_util.utcnow())
+        self.async_update_listeners()
+        if rejected:
+            raise WriteNotAppliedError(rejected)
+
+    async def _async_read_back(
+        self, writes: Mapping[ModbusParameter, int], before: Mapping[int, Any]
+    ) -> dict[int, Any]:
+        """Read the written registers and their dependents until the unit reflects the writes."""
+        registers = dict.fromkeys(writes)
+        for register in writes:
+            registers.update(dict.fromkeys(register_map[address] for address in register.dependents))
+
+        deadline = time.monotonic() + self._read_back_timeout
+        delay = READ_BACK_INITIAL_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            data = await self.config_entry.runtime_data.client.async_get_data(registers)
+            if self._writes_applied(writes, before, data) or time.monotonic() + delay > deadline:
+                return data
+            delay = min(delay * 2, READ_BACK_MAX_DELAY)
+
+    @staticmethod
+    def _writes_applied(
+        writes: Mapping[ModbusParameter, int],
+        before: Mapping[int, Any],
+        data: Mapping[int, Any],
+    ) -> bool:
+        """Return whether data read after a write reflects the written values."""
+        for register, value in writes.items():
+            key = register.register - 1
+            if not register.dependents:
+                if data.get(key) != value:
+                    return False
+                continue
+
+            # Requests are consumed by the unit, which then updates the dependent registers
+            dependent_keys = [address - 1 for address in register.dependents]
+            if data.get(key) == value and all(data.get(dep) == before.get(dep) for dep in dependent_keys):
+                return False
+        return True
+
+    async def async_config_entry_first_refresh(self) -> None:
+        """
+        Refresh data for the first time when the config entry is set up.
+
+        When an earlier start stored the identity of the unit, the unit is read in the background, so setup does not
+        wait for it. Entities start from the register values stored by that start, `data_updated` telling how old they
+        are, or are unavailable until the first read when none were stored.
+        """
+        await self.store.async_load()
+        if self.store.identity is None:
+            await super().async_config_entry_first_refresh()
+            return
+
+        if (snapshot := self.store.snapshot) is not None:
+            self.data, self.data_updated = snapshot
+        await self._async_setup()
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_refresh(),
+            f"{DOMAIN} {self.config_entry.entry_id} first refresh",
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call or pending write, and write what was stored, so neither outlives the entry."""
+        await super().async_shutdown()
+        self._updates_stopped = True
+        self._async_cancel_update()
+        if self._write_task is not None:
+            self._write_task.cancel()
+            self._write_task = None
+        await self.store.async_flush()
 
     async def _async_setup(self) -> None:
-        """Set up the coordinator."""
-        menu = await self.config_entry.runtime_data.client.async_get_endpoint("menu")
-        unit_version = await self.config_entry.runtime_data.client.async_get_endpoint("unit_version")
-        self.config_entry.runtime_data.mac_address = menu["mac"]
-        self.config_entry.runtime_data.serial_number = unit_version["System Serial Number"]
-        self.config_entry.runtime_data.mb_hw_version = unit_version["MB HW version"]
-        self.config_entry.runtime_data.mb_model = unit_version["MB Model"]
-        self.config_entry.runtime_data.mb_sw_version = unit_version["MB SW version"]
-        self.config_entry.runtime_data.iam_sw_version = unit_version["IAM SW version"]
-
-        # Required for setup of climate entity
-        self.register_modbus_parameters(parameter_map["REG_FUNCTION_ACTIVE_HEATER"])
-        self.register_modbus_parameters(parameter_map["REG_FUNCTION_ACTIVE_COOLER"])
-        self.data = await self._async_update_data()
+        """Set up the coordinator, only waiting for the identity of the unit if an earlier start did not store it."""
+        if (identity := self.store.identity) is None:
+            await self._async_update_identity()
+            return
+
+        self.config_entry.runtime_data.identity = identity
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_update_stored_identity(),
+            f"{DOMAIN} {self.config_entry.entry_id} device identity",
+        )
+
+    async def _async_update_identity(self, *, refresh: bool = False) -> None:
+        """Get the identity of the unit, storing it and updating the device when it changed."""
+        identity = await async_get_device_identity(self.hass, self.config_entry.runtime_data.client, refresh=refresh)
+        if identity == self.store.identity:
+            return
+
+        self.config_entry.runtime_data.identity = identity
+        self.store.async_set_identity(identity)
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, self.config_entry.entry_id)}):
+            device_registry.async_update_device(
+                device.id,
+                model=identity.mb_model,
+                hw_version=identity.mb_hw_version,
+                sw_version=identity.mb_sw_version,
+                serial_number=identity.serial_number,
+            )
+
+    async def _async_update_stored_identity(self) -> None:
+        """Refresh the stored identity in the background, e.g. after a firmware update."""
+        try:
+            await self._async_update_identity(refresh=True)
+        except SystemairApiClientError as exception:
+            LOGGER.debug("Could not refresh the device identity - %s", exception)
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply the options of the config entry, without interrupting updates."""
+        options = self.config_entry.options
+        self._min_update_interval = timedelta(
+            seconds=options.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+        )
+        self._max_update_interval = timedelta(
+            seconds=options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+        )
+        self._read_back_timeout = options.get(CONF_READ_BACK_TIMEOUT, READ_BACK_TIMEOUT)
+        self.poll_intervals = {
+            param: timedelta(seconds=options.get(option, default.total_seconds()))
+            for option, (params, default) in POLL_INTERVAL_GROUPS.items()
+            for param in params
+        }
+
+        # Registers read less often than before are read at their usual time, registers read more often sooner
+        now = time.monotonic()
+        for param, next_poll in self._next_poll.items():
+            if (interval := self.poll_intervals.get(param)) is not None:
+                self._next_poll[param] = min(next_poll, now + interval.total_seconds())
+
+        disabled = frozenset(
+            param for option, params in REGISTER_GROUPS.items() if not options.get(option, True) for param in params
+        )
+        if disabled != self.disabled_parameters:
+            self._async_set_disabled_parameters(disabled)
+
+        interval = self._clamp_update_interval(self.interval)
+        if interval != self.interval:
+            self.interval = interval
+            self._async_schedule_update()
+
+    @callback
+    def _async_set_disabled_parameters(self, disabled: frozenset[ModbusParameter]) -> None:
+        """Stop reading the registers of turned off groups, reading registers turned on again right away."""
+        enabled = self.disabled_parameters - disabled
+        self.disabled_parameters = disabled
+        for param in enabled:
+            self._next_poll.pop(param, None)
+
+        # Entities reading turned off registers become unavailable
+        self._changed_keys = None
+        self.async_update_listeners()
+        if enabled and self.data is not None:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self.async_request_refresh(),
+                f"{DOMAIN} {self.config_entry.entry_id} read enabled registers",
+            )
+
+    def _clamp_update_interval(self, interval: timedelta) -> timedelta:
+        """Return the interval, within the configured bounds."""
+        return min(max(interval, self._min_update_interval), self._max_update_interval)
+
+    @callback
+    def _async_update_faster(self) -> None:
+        """Update at the shortest interval for a while, as the unit is changing."""
+        self._fast_updates = FAST_UPDATES_AFTER_CHANGE
+        if self.interval != self._min_update_interval:
+            self.interval = self._min_update_interval
+            self._async_schedule_update()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> CALLBACK_TYPE:
+        """Listen for data updates, updating while anything listens."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if self._unsub_update is None:
+            self._async_schedule_update()
+
+        @callback
+        def remove() -> None:
+            remove_listener()
+            if not self._listeners:
+                self._async_cancel_update()
+
+        return remove
+
+    @callback
+    def _async_schedule_update(self) -> None:
+        """Schedule the next update in the update slot of this unit, so units spread their updates over the interval."""
+        self._async_cancel_update()
+        if (
+            self._updates_stopped
+            or not self._listeners
+            or self.hass.is_stopping
+            or self.config_entry.pref_disable_polling
+        ):
+            return
+        when = SystemairScheduler.next_update(self.hass.loop.time(), self.interval.total_seconds(), self._phase)
+        self._unsub_update = async_call_at(self.hass, self._async_handle_update, when)
+
+    @callback
+    def _async_cancel_update(self) -> None:
+        """Cancel the scheduled update."""
+        if self._unsub_update is not None:
+            self._unsub_update()
+            self._unsub_update = None
+
+    @callback
+    def _async_handle_update(self, _now: datetime) -> None:
+        """Update in the background, the next update is scheduled once this one finished."""
+        self._unsub_update = None
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_refresh(),
+            f"{DOMAIN} {self.config_entry.entry_id} update",
+        )
+
+    def _adapt_update_interval(self, *, healthy: bool, active: bool) -> None:
+        """Shorten the update interval while the unit is changing, lengthen it while stable or unhealthy."""
+        if not healthy:
+            interval = self.interval * UPDATE_INTERVAL_BACKOFF
+        elif active:
+            self._fast_updates = FAST_UPDATES_AFTER_CHANGE
+            interval = self._min_update_interval
+        elif self._fast_updates:
+            self._fast_updates -= 1
+            interval = self._min_update_interval
+        else:
+            interval = self.interval * UPDATE_INTERVAL_GROWTH
+
+        interval = self._clamp_update_interval(interval)
+        if interval != self.interval:
+            LOGGER.debug("Updating every %s seconds", interval.total_seconds())
+            self.interval = interval
+
+    def polled_parameters(self) -> list[ModbusParameter]:
+        """Return the registered parameters that are read, leaving out those of turned off groups."""
+        return [param for param in self.modbus_parameters if param not in self.disabled_parameters]
+
+    def _due_modbus_parameters(self, now: float) -> list[ModbusParameter]:
+        """Return the polled parameters that are due to be read."""
+        return [param for param in self.polled_parameters() if self._next_poll.get(param, 0) <= now]
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
+        self._changed_keys = None
+        now = time.monotonic()
+        due = self._due_modbus_parameters(now)
+        if not due:
+            return self.data
+
+        client = self.config_entry.runtime_data.client
+        started = dt_util.utcnow()
+        before = copy.copy(client.metrics)
         try:
-            return await self.config_entry.runtime_data.client.async_get_data(self.modbus_parameters)
+            data = await client.async_get_data(due)
         except SystemairApiClientError as exception:
+            self.poll_history.append(
+                PollCycle.from_metrics(
+                    before,
+                    client.metrics,
+                    started=started,
+                    duration=time.monotonic() - now,
+                    registers=len(due),
+                    error=repr(exception),
+                )
+            )
+            self._adapt_update_interval(healthy=False, active=False)
             raise UpdateFailed(exception) from exception
+        # Registers read back after a write while this update was in flight keep the values read back
+        for key in [key for key in data if self._read_back.get(key, 0) > now]:
+            del data[key]
+        self._read_back = {key: done for key, done in self._read_back.items() if done > now}
+        # Only retries of this update count, not those of writes or identity refreshes since the last update
+        healthy = client.metrics.retries == before.retries and time.monotonic() - now < SLOW_UPDATE_DURATION
+
+        for param in due:
+            if (interval := self.poll_intervals.get(param)) is not None:
+                self._next_poll[param] = now + interval.total_seconds()
+
+        if unconfirmed := {key: value for key, value in self._unconfirmed.items() if key in data}:
+            for key in unconfirmed:
+                del self._unconfirmed[key]
+            if rejected := self._async_reconcile_optimistic(unconfirmed, data):
+                # Roll back right away, the new data only notifies listeners when it differs
+                self._async_notify_optimistic(rejected)
+
+        self._changed_keys = self._changed_data_keys(data)
+        self.data_updated = started
+        self.poll_history.append(
+            PollCycle.from_metrics(
+                before,
+                client.metrics,
+                started=started,
+                duration=time.monotonic() - now,
+                registers=len(due),
+                changed=None if self._changed_keys is None else len(self._changed_keys),
+            )
+        )
+        self._adapt_update_interval(
+            healthy=healthy,
+            active=self._changed_keys is not None and not self._changed_keys.isdisjoint(self._activity_keys),
+        )
+        data = {**(self.data or {}), **data}
+        self.store.async_set_snapshot(data, started)
+        return data
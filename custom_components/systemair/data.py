@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from .api import DeviceIdentity
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
-    from .api import SystemairApiClient
+    from .api import SystemairTransport
     from .coordinator import SystemairDataUpdateCoordinator
 
 
@@ -20,13 +22,11 @@ type SystemairConfigEntry = ConfigEntry[SystemairData]
 class SystemairData:
     """Data for the Systemair."""
 
-    client: SystemairApiClient
+    client: SystemairTransport
     coordinator: SystemairDataUpdateCoordinator
     integration: Integration
 
-    iam_sw_version: str | None = None
-    mb_hw_version: str | None = None
-    mb_model: str | None = None
-    mb_sw_version: str | None = None
-    serial_number: str | None = None
-    mac_address: str | None = None
+    identity: DeviceIdentity = field(default_factory=DeviceIdentity)
+
+    # Seconds the setup of the config entry took
+    setup_duration: float | None = None
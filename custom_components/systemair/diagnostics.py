@@ -0,0 +1,69 @@
+"""Diagnostics support for Systemair."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_IP_ADDRESS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import SystemairConfigEntry
+
+TO_REDACT = {CONF_IP_ADDRESS, "mac_address", "serial_number"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: SystemairConfigEntry,
+) -> dict[str, Any]:
+    """
+    Return diagnostics for a config entry.
+
+    Holds the requests an update sends, the raw and decoded register values, and the metrics of the requests
+    and latest updates, enough to look into slow updates without debug logging.
+    """
+    data = entry.runtime_data
+    client = data.client
+    coordinator = data.coordinator
+    parameters = list(coordinator.modbus_parameters)
+    polled = coordinator.polled_parameters()
+    return async_redact_data(
+        {
+            "entry": {
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+            },
+            "device": asdict(data.identity),
+            "setup_duration": data.setup_duration,
+            "coordinator": {
+                "update_interval": coordinator.interval.total_seconds(),
+                "last_update_success": coordinator.last_update_success,
+                "data_updated": coordinator.data_updated.isoformat() if coordinator.data_updated else None,
+                "registers": len(parameters),
+                "polled_registers": len(polled),
+                "poll_intervals": {
+                    param.short: interval.total_seconds() for param, interval in coordinator.poll_intervals.items()
+                },
+            },
+            "breaker": {
+                "state": client.breaker.state,
+                "failures": client.breaker.failures,
+                "recovery_time": client.breaker.recovery_time,
+            },
+            "requests": client.metrics.as_dict(),
+            "poll_history": [cycle.as_dict() for cycle in coordinator.poll_history],
+            "plan": [
+                [{"start": span.start, "count": span.count} for span in request]
+                for request in client.plan_requests(polled)
+            ],
+            "data": coordinator.data,
+            "decoded": {param.short: coordinator.get_modbus_data(param) for param in parameters}
+            if coordinator.data is not None
+            else None,
+        },
+        TO_REDACT,
+    )
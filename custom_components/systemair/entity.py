@@ -2,28 +2,40 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION
 from .coordinator import SystemairDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .modbus import ModbusParameter
+
 
 class SystemairEntity(CoordinatorEntity[SystemairDataUpdateCoordinator]):
     """SystemairEntity class."""
 
     _attr_attribution = ATTRIBUTION
 
-    def __init__(self, coordinator: SystemairDataUpdateCoordinator) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: SystemairDataUpdateCoordinator,
+        registers: Iterable[ModbusParameter] = (),
+    ) -> None:
+        """Initialize, subscribing to updates of the registers the entity reads."""
+        self._registers = tuple(registers)
+        super().__init__(coordinator, context=coordinator.register_keys(self._registers) or None)
         self._attr_unique_id = coordinator.config_entry.entry_id
         self._attr_device_info = DeviceInfo(
             manufacturer="Systemair",
-            model=coordinator.config_entry.runtime_data.mb_model,
-            hw_version=coordinator.config_entry.runtime_data.mb_hw_version,
-            sw_version=coordinator.config_entry.runtime_data.mb_sw_version,
-            serial_number=coordinator.config_entry.runtime_data.serial_number,
+            model=coordinator.config_entry.runtime_data.identity.mb_model,
+            hw_version=coordinator.config_entry.runtime_data.identity.mb_hw_version,
+            sw_version=coordinator.config_entry.runtime_data.identity.mb_sw_version,
+            serial_number=coordinator.config_entry.runtime_data.identity.serial_number,
             identifiers={
                 (
                     coordinator.config_entry.domain,
@@ -31,3 +43,16 @@ class SystemairEntity(CoordinatorEntity[SystemairDataUpdateCoordinator]):
                 ),
             },
         )
+
+    @property
+    def available(self) -> bool:
+        """
+        Return if entity is available.
+
+        Not before the first data arrived from the unit or the store, nor while its registers are turned off.
+        """
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.coordinator.disabled_parameters.isdisjoint(self._registers)
+        )
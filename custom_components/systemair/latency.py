@@ -0,0 +1,68 @@
+"""Latency tracking for requests to a Systemair unit."""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .const import (
+    LATENCY_MIN_SAMPLES,
+    LATENCY_PERCENTILE,
+    LATENCY_TIMEOUT_FACTOR,
+    LATENCY_TIMEOUT_MARGIN,
+    LATENCY_WINDOW,
+)
+
+
+class LatencyTracker:
+    """
+    Tracks the latency of requests to a unit, by request size, and derives timeouts from it.
+
+    Requests are grouped by the power of two of their number of registers, as larger reads take longer.
+    The timeout of a group is a high percentile of its recent latencies, with a factor and margin on top,
+    clamped to the given bounds. Until a group has enough samples, the upper bound is used.
+    """
+
+    def __init__(self, min_timeout: float, max_timeout: float) -> None:
+        """Initialize the tracker."""
+        self._samples: dict[int, deque[float]] = {}
+        self.set_bounds(min_timeout, max_timeout)
+
+    def set_bounds(self, min_timeout: float, max_timeout: float) -> None:
+        """Change the bounds of the timeouts, keeping the recorded latencies."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._timeouts: dict[int, float] = {}
+
+    @staticmethod
+    def _bucket(size: int) -> int:
+        """Return the group of a request of the given number of registers."""
+        return size.bit_length()
+
+    def record(self, size: int, latency: float) -> None:
+        """Record the latency of a request, a timed out request is recorded with its timeout."""
+        bucket = self._bucket(size)
+        samples = self._samples.setdefault(bucket, deque(maxlen=LATENCY_WINDOW))
+        samples.append(latency)
+        self._timeouts.pop(bucket, None)
+
+    def percentile(self, size: int) -> float | None:
+        """Return the high percentile latency of requests of the given number of registers, if known."""
+        samples = self._samples.get(self._bucket(size))
+        if samples is None or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * LATENCY_PERCENTILE))]
+
+    def timeout(self, size: int) -> float:
+        """Return the timeout for a request of the given number of registers."""
+        bucket = self._bucket(size)
+        if (timeout := self._timeouts.get(bucket)) is not None:
+            return timeout
+
+        if (percentile := self.percentile(size)) is None:
+            return self.max_timeout
+        timeout = self._timeouts[bucket] = min(
+            self.max_timeout,
+            max(self.min_timeout, percentile * LATENCY_TIMEOUT_FACTOR + LATENCY_TIMEOUT_MARGIN),
+        )
+        return timeout
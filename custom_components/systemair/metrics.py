@@ -0,0 +1,112 @@
+"""Metrics of the requests sent to a Systemair unit."""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import REQUEST_LATENCY_BUCKETS
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+@dataclass(kw_only=True)
+class RequestMetrics:
+    """Counts and timings of the requests sent to a unit since the client was created."""
+
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    registers: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency_total: float = 0.0
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(REQUEST_LATENCY_BUCKETS) + 1))
+    # Failed requests by exception class, e.g. SystemairApiClientDisconnectedError for MB DISCONNECTED
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def record(self, *, latency: float, registers: int, sent: int, received: int) -> None:
+        """Record a request the unit responded to."""
+        self.requests += 1
+        self.registers += registers
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.latency_total += latency
+        self.latency_buckets[bisect.bisect_left(REQUEST_LATENCY_BUCKETS, latency)] += 1
+
+    def record_error(self, exception: BaseException) -> None:
+        """Record a failed request."""
+        self.failures += 1
+        self.errors[type(exception).__name__] += 1
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean seconds requests the unit responded to took."""
+        return self.latency_total / self.requests if self.requests else None
+
+    @property
+    def registers_per_request(self) -> float | None:
+        """Return the mean number of registers read or written per request."""
+        return self.registers / self.requests if self.requests else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for the diagnostics."""
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "registers": self.registers,
+            "registers_per_request": self.registers_per_request,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_latency": self.mean_latency,
+            "latency_histogram": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(REQUEST_LATENCY_BUCKETS, self.latency_buckets, strict=False)
+                },
+                "slower": self.latency_buckets[-1],
+            },
+            "errors": dict(self.errors),
+        }
+
+
+@dataclass(kw_only=True, frozen=True)
+class PollCycle:
+    """Describes one update of the coordinator, with the requests it sent."""
+
+    started: datetime
+    duration: float
+    registers: int
+    requests: int
+    failures: int
+    retries: int
+    bytes_sent: int
+    bytes_received: int
+    # Registers whose value changed, None when unknown
+    changed: int | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_metrics(
+        cls,
+        before: RequestMetrics,
+        after: RequestMetrics,
+        **kwargs: Any,
+    ) -> PollCycle:
+        """Create a poll cycle from the metrics of the client before and after the update."""
+        return cls(
+            requests=after.requests + after.failures - before.requests - before.failures,
+            failures=after.failures - before.failures,
+            retries=after.retries - before.retries,
+            bytes_sent=after.bytes_sent - before.bytes_sent,
+            bytes_received=after.bytes_received - before.bytes_received,
+            **kwargs,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the poll cycle for the diagnostics."""
+        return {**asdict(self), "started": self.started.isoformat()}
@@ -1,7 +1,13 @@
 """Modbus parameters for Systemair ventilation units."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 
 class IntegerType(Enum):
@@ -50,6 +56,50 @@ class ModbusParameter:
     boolean: bool | None = None
     scale_factor: int | None = None
     combine_with_32_bit: int | None = None
+    # Registers the unit updates as a consequence of writing this register
+    dependents: tuple[int, ...] = ()
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class RegisterDecoder:
+    """Decodes the value of a Modbus parameter from the data returned by the API."""
+
+    key: int
+    high_key: int | None
+    boolean: bool
+    signed: bool
+    scale_factor: int
+
+    @classmethod
+    def from_parameter(cls, parameter: ModbusParameter) -> RegisterDecoder:
+        """Compile a decoder for the given parameter."""
+        return cls(
+            key=parameter.register - 1,
+            high_key=parameter.combine_with_32_bit - 1 if parameter.combine_with_32_bit else None,
+            boolean=bool(parameter.boolean),
+            signed=parameter.sig == IntegerType.INT,
+            scale_factor=parameter.scale_factor or 1,
+        )
+
+    def decode(self, data: Mapping[int, Any]) -> float:
+        """Decode the value of the parameter."""
+        value = data.get(self.key)
+
+        if value is None:
+            return 0
+        if self.boolean:
+            return value != 0
+        value = int(value)
+
+        if self.high_key is not None:
+            high = data.get(self.high_key)
+            if high is None:
+                return 0
+            value += int(high) << 16
+
+        if self.signed and value > (1 << 15):
+            value = -(65536 - value)
+        return value / self.scale_factor
 
 
 parameters_list = [
@@ -284,6 +334,7 @@ parameters_list = [
         ),
         min_value=0,
         max_value=7,
+        dependents=(1161, 1111, 1112),
     ),
     ModbusParameter(
         register=1177,
@@ -746,6 +797,13 @@ parameters_list = [
 
 parameter_map = {param.short: param for param in parameters_list}
 
+register_map = {param.register: param for param in parameters_list}
+
+register_type_map = {
+    reg_type: {param.register: param for param in parameters_list if param.reg_type == reg_type}
+    for reg_type in RegisterType
+}
+
 operation_parameters = {
     short: parameter_map[short]
     for short in [
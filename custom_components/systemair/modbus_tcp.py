@@ -0,0 +1,252 @@
+"""Systemair Modbus TCP Client."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+import time
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any
+
+import async_timeout
+
+from .api import (
+    DeviceIdentity,
+    SystemairApiClientCommunicationError,
+    SystemairApiClientError,
+    SystemairApiClientLimits,
+    SystemairApiClientUnavailableError,
+    SystemairTransport,
+)
+from .breaker import CircuitBreaker
+from .const import DEFAULT_MODBUS_PORT, DEFAULT_MODBUS_UNIT_ID, LOGGER, MODBUS_TIMEOUT, PRIORITY_READ, PRIORITY_WRITE
+from .limiter import PriorityLimiter
+from .metrics import RequestMetrics
+from .modbus import RegisterType, parameter_map
+from .planner import plan_register_spans
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from .api import RetryPolicy
+    from .modbus import ModbusParameter
+    from .planner import RegisterSpan
+
+FUNCTION_READ_HOLDING_REGISTERS = 0x03
+FUNCTION_READ_INPUT_REGISTERS = 0x04
+FUNCTION_WRITE_SINGLE_REGISTER = 0x06
+FUNCTION_WRITE_MULTIPLE_REGISTERS = 0x10
+EXCEPTION_FLAG = 0x80
+
+READ_FUNCTIONS = {
+    RegisterType.Input: FUNCTION_READ_INPUT_REGISTERS,
+    RegisterType.Holding: FUNCTION_READ_HOLDING_REGISTERS,
+}
+
+# Transaction id, protocol id, length and unit id
+MBAP_HEADER = struct.Struct(">HHHB")
+
+
+class SystemairModbusTcpClient(SystemairTransport):
+    """Systemair Modbus TCP Client, talking to the unit directly or through a Modbus TCP gateway."""
+
+    def __init__(  # noqa: PLR0913 Connection settings and shared limits
+        self,
+        host: str,
+        port: int = DEFAULT_MODBUS_PORT,
+        unit_id: int = DEFAULT_MODBUS_UNIT_ID,
+        max_register_gap: int = 0,
+        limits: SystemairApiClientLimits | None = None,
+        limiter: PriorityLimiter | None = None,
+    ) -> None:
+        """
+        Systemair Modbus TCP Client.
+
+        Only the retry policies of `limits` apply, `limiter` is shared with the clients of other units.
+        """
+        self._host = host
+        self._port = port
+        self._unit_id = unit_id
+        # Unused registers inside a read may not exist on the unit, so only contiguous registers are merged by default
+        self._max_register_gap = max_register_gap
+        self._limits = limits or SystemairApiClientLimits()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        # One transaction at a time, with writes going ahead of waiting reads
+        self._lock = PriorityLimiter(1)
+        self._limiter = limiter
+        self._transaction_id = 0
+        self.breaker = CircuitBreaker()
+        self.metrics = RequestMetrics()
+
+    @property
+    def address(self) -> str:
+        """Return the address of the unit, as host, port and unit id."""
+        return f"{self._host}:{self._port}:{self._unit_id}"
+
+    async def async_test_connection(self) -> Any:
+        """Test connection to the unit."""
+        return await self.async_get_data([parameter_map["REG_USERMODE_MODE"]])
+
+    async def async_get_device_identity(self) -> DeviceIdentity:
+        """Get information identifying the unit, which is not available over Modbus."""
+        return DeviceIdentity()
+
+    async def async_get_data(self, reg: Iterable[ModbusParameter]) -> dict[int, Any]:
+        """Read modbus registers, using the read function matching the register type."""
+        data: dict[int, Any] = {}
+        for function, span in self._plan_reads(reg):
+            response = await self._async_transaction(
+                struct.pack(">BHH", function, span.start, span.count), registers=span.count
+            )
+            values = struct.unpack(f">{span.count}H", response[2 : 2 + span.count * 2])
+            data.update({span.start + offset: value for offset, value in enumerate(values)})
+        return data
+
+    def plan_requests(self, reg: Iterable[ModbusParameter]) -> list[list[RegisterSpan]]:
+        """Return the spans read by each request, a single span per request."""
+        return [[span] for _, span in self._plan_reads(reg)]
+
+    def _plan_reads(self, reg: Iterable[ModbusParameter]) -> list[tuple[int, RegisterSpan]]:
+        """Return the read function and span of each request reading the registers."""
+        registers = list(reg)
+        return [
+            (function, span)
+            for reg_type, function in READ_FUNCTIONS.items()
+            for span in plan_register_spans(
+                (param for param in registers if param.reg_type == reg_type),
+                max_gap=self._max_register_gap,
+            )
+        ]
+
+    async def async_set_data_batch(self, values: Mapping[ModbusParameter, int]) -> Any:
+        """Write several registers to the unit, one request per range of consecutive registers."""
+        ranges: list[list[tuple[int, int]]] = []
+        for address, value in sorted((registry.register - 1, value & 0xFFFF) for registry, value in values.items()):
+            if ranges and ranges[-1][-1][0] == address - 1:
+                ranges[-1].append((address, value))
+            else:
+                ranges.append([(address, value)])
+
+        for writes in ranges:
+            start = writes[0][0]
+            if len(writes) == 1:
+                pdu = struct.pack(">BHH", FUNCTION_WRITE_SINGLE_REGISTER, start, writes[0][1])
+            else:
+                pdu = struct.pack(
+                    f">BHHB{len(writes)}H",
+                    FUNCTION_WRITE_MULTIPLE_REGISTERS,
+                    start,
+                    len(writes),
+                    len(writes) * 2,
+                    *(value for _, value in writes),
+                )
+            await self._async_transaction(pdu, registers=len(writes), priority=PRIORITY_WRITE)
+        return "OK"
+
+    async def async_close(self) -> None:
+        """Close the connection to the unit."""
+        async with self._lock.acquire(PRIORITY_WRITE):
+            await self._async_disconnect()
+
+    def set_limits(self, limits: SystemairApiClientLimits) -> None:
+        """Apply new retry policies, requests over Modbus TCP are sent one at a time and are not batched by size."""
+        self._limits = limits
+
+    async def _async_disconnect(self) -> None:
+        """Close the connection, a new one is opened by the next transaction."""
+        if self._writer is None:
+            return
+        writer, self._reader, self._writer = self._writer, None, None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError as exception:
+            LOGGER.debug("Error closing Modbus TCP connection - %s", exception)
+
+    def _retry_policy(self, exception: Exception) -> RetryPolicy:
+        """Return the retry policy for a failed transaction, any connection is reopened by the next attempt."""
+        if isinstance(exception, TimeoutError):
+            return self._limits.retry_timeout
+        return self._limits.retry_connection
+
+    async def _async_transaction(self, pdu: bytes, *, registers: int, priority: int = PRIORITY_READ) -> bytes:
+        """Send a request and return the response PDU, retried according to the retry policy for the kind of error."""
+        if not self.breaker.allow_request():
+            msg = f"Unit did not respond to recent requests, retrying in {self.breaker.recovery_time:.0f} seconds"
+            raise SystemairApiClientUnavailableError(
+                msg,
+            )
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._async_exchange(pdu, registers=registers, priority=priority)
+                break
+            except (
+                TimeoutError,
+                OSError,
+                asyncio.IncompleteReadError,
+                SystemairApiClientCommunicationError,
+            ) as exception:
+                policy = self._retry_policy(exception)
+                if attempt + 1 >= policy.attempts:
+                    self.breaker.record_failure()
+                    msg = f"Error communicating with {self._host}:{self._port} - {exception}"
+                    raise SystemairApiClientCommunicationError(
+                        msg,
+                    ) from exception
+                delay = policy.delay(attempt)
+                LOGGER.debug("Modbus TCP request failed (%r), retrying in %.2f seconds", exception, delay)
+                attempt += 1
+                self.metrics.retries += 1
+                await asyncio.sleep(delay)
+
+        self.breaker.record_success()
+        if response[0] & EXCEPTION_FLAG:
+            msg = f"Modbus exception {response[1]} for function {response[0] & ~EXCEPTION_FLAG}"
+            raise SystemairApiClientError(
+                msg,
+            )
+        return response
+
+    async def _async_exchange(self, pdu: bytes, *, registers: int, priority: int) -> bytes:
+        """Send a request and read its response, one transaction at a time, dropping the connection on errors."""
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(self._lock.acquire(priority))
+            # Only take a slot shared with other units once this unit is ready to send the request
+            if self._limiter is not None:
+                await stack.enter_async_context(self._limiter.acquire(priority))
+            self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+            transaction_id = self._transaction_id
+            frame = MBAP_HEADER.pack(transaction_id, 0, len(pdu) + 1, self._unit_id) + pdu
+            start = time.monotonic()
+            try:
+                async with async_timeout.timeout(MODBUS_TIMEOUT):
+                    if self._writer is None:
+                        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+                    self._writer.write(frame)
+                    await self._writer.drain()
+                    response_id, _, length, _ = MBAP_HEADER.unpack(await self._reader.readexactly(MBAP_HEADER.size))
+                    response = await self._reader.readexactly(length - 1)
+            except (TimeoutError, OSError, asyncio.IncompleteReadError) as exception:
+                self.metrics.record_error(exception)
+                await self._async_disconnect()
+                raise
+
+            if response_id != transaction_id:
+                await self._async_disconnect()
+                msg = f"Unexpected transaction id {response_id}, expected {transaction_id}"
+                exception = SystemairApiClientCommunicationError(
+                    msg,
+                )
+                self.metrics.record_error(exception)
+                raise exception
+
+        self.metrics.record(
+            latency=time.monotonic() - start,
+            registers=registers,
+            sent=len(frame),
+            received=MBAP_HEADER.size + len(response),
+        )
+        return response
@@ -80,6 +80,8 @@ NUMBERS: tuple[SystemairNumberEntityDescription, ...] = (
     ),
 )
 
+ENTITY_REGISTERS = tuple((entity_description, (entity_description.registry,)) for entity_description in NUMBERS)
+
 
 async def async_setup_entry(
     _hass: HomeAssistant,
@@ -109,7 +111,7 @@ class SystemairNumber(SystemairEntity, NumberEntity):
         entity_description: SystemairNumberEntityDescription,
     ) -> None:
         """Initialize the number class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, registers=(entity_description.registry,))
 
         self.entity_description = entity_description
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
@@ -127,5 +129,3 @@ class SystemairNumber(SystemairEntity, NumberEntity):
             await self.coordinator.set_modbus_data(self.entity_description.registry, value)
         except (asyncio.exceptions.TimeoutError, ConnectionError) as exc:
             raise HomeAssistantError from exc
-        finally:
-            await self.coordinator.async_refresh()
@@ -0,0 +1,60 @@
+"""Read planning for Systemair Modbus registers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .modbus import ModbusParameter
+
+# Upper bound of registers the unit will return for a single Modbus read
+MAX_SPAN_REGISTERS = 125
+
+
+@dataclass(kw_only=True, frozen=True)
+class RegisterSpan:
+    """Describes a range of consecutive Modbus registers read in one go."""
+
+    start: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """Return the address following the last register in the span."""
+        return self.start + self.count
+
+
+def plan_register_spans(
+    parameters: Iterable[ModbusParameter],
+    max_gap: int,
+    max_count: int = MAX_SPAN_REGISTERS,
+) -> list[RegisterSpan]:
+    """
+    Merge the addresses of the given parameters into spans.
+
+    Addresses are zero based, as used by the API. Two addresses end up in the same span when at most
+    `max_gap` unused registers lie between them and the span stays within `max_count` registers.
+    """
+    spans: list[RegisterSpan] = []
+    for address in sorted({param.register - 1 for param in parameters}):
+        if spans and address - spans[-1].end <= max_gap and address - spans[-1].start < max_count:
+            spans[-1] = RegisterSpan(start=spans[-1].start, count=address - spans[-1].start + 1)
+        else:
+            spans.append(RegisterSpan(start=address, count=1))
+    return spans
+
+
+def expand_span_response(response: dict[str, Any]) -> dict[int, Any]:
+    """Map a response to span reads back to one value per zero based register address."""
+    data = {}
+    for key, value in response.items():
+        if isinstance(value, list):
+            start = int(key)
+            for offset, item in enumerate(value):
+                data[start + offset] = item
+        else:
+            data[int(key)] = value
+    return data
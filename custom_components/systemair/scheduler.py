@@ -0,0 +1,55 @@
+"""Scheduling of updates and requests across all Systemair units."""
+
+from __future__ import annotations
+
+import itertools
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, FLEET_MAX_CONCURRENT_REQUESTS
+from .limiter import PriorityLimiter
+
+# Spreads phases evenly, however many units are added or removed
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class SystemairScheduler:
+    """
+    Coordinates all Systemair units in Home Assistant.
+
+    Every unit gets a phase, so units with the same update interval spread their updates over the interval
+    instead of updating at the same time. Requests to all units share a limit, with writes going first.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.limiter = PriorityLimiter(FLEET_MAX_CONCURRENT_REQUESTS)
+        self._slots: dict[str, int] = {}
+
+    @callback
+    def async_register(self, entry_id: str) -> float:
+        """Register a unit, returning its phase as a fraction of the update interval."""
+        if (slot := self._slots.get(entry_id)) is None:
+            used = set(self._slots.values())
+            slot = self._slots[entry_id] = next(slot for slot in itertools.count() if slot not in used)
+        return (slot * GOLDEN_RATIO_FRACTION) % 1
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Release the phase of a unit."""
+        self._slots.pop(entry_id, None)
+
+    @staticmethod
+    def next_update(now: float, interval: float, phase: float) -> float:
+        """Return the time of the update slot nearest to one interval from now."""
+        offset = phase * interval
+        slot = round((now + interval - offset) / interval) * interval + offset
+        return slot if slot > now else slot + interval
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> SystemairScheduler:
+    """Return the scheduler shared by all Systemair units."""
+    if (scheduler := hass.data.get(DOMAIN)) is None:
+        scheduler = hass.data[DOMAIN] = SystemairScheduler()
+    return scheduler
@@ -12,12 +12,17 @@ from homeassistant.components.sensor import (
 from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
 from homeassistant.const import PERCENTAGE, REVOLUTIONS_PER_MINUTE, EntityCategory, UnitOfTemperature, UnitOfTime
 
+from .breaker import BreakerState
 from .entity import SystemairEntity
 from .modbus import ModbusParameter, alarm_parameters, parameter_map
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
     from .coordinator import SystemairDataUpdateCoordinator
     from .data import SystemairConfigEntry
@@ -119,6 +124,68 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+@dataclass(kw_only=True, frozen=True)
+class SystemairDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Systemair sensor entity reporting on the connection to the unit."""
+
+    value_fn: Callable[[SystemairDataUpdateCoordinator], StateType | datetime]
+
+
+DIAGNOSTIC_DESCRIPTIONS = (
+    SystemairDiagnosticSensorEntityDescription(
+        key="circuit_breaker",
+        translation_key="circuit_breaker",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in BreakerState],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.config_entry.runtime_data.client.breaker.state,
+    ),
+    SystemairDiagnosticSensorEntityDescription(
+        key="last_update",
+        translation_key="last_update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.data_updated,
+    ),
+    SystemairDiagnosticSensorEntityDescription(
+        key="request_latency",
+        translation_key="request_latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.config_entry.runtime_data.client.metrics.mean_latency,
+    ),
+    SystemairDiagnosticSensorEntityDescription(
+        key="registers_per_request",
+        translation_key="registers_per_request",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.config_entry.runtime_data.client.metrics.registers_per_request,
+    ),
+    *(
+        SystemairDiagnosticSensorEntityDescription(
+            key=key,
+            translation_key=key,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda coordinator, key=key: getattr(coordinator.config_entry.runtime_data.client.metrics, key),
+        )
+        for key in ("requests", "failures", "retries")
+    ),
+)
+
+ENTITY_REGISTERS = tuple(
+    (entity_description, (entity_description.registry,)) for entity_description in ENTITY_DESCRIPTIONS
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
     entry: SystemairConfigEntry,
@@ -132,6 +199,13 @@ async def async_setup_entry(
         )
         for entity_description in ENTITY_DESCRIPTIONS
     )
+    async_add_entities(
+        SystemairDiagnosticSensor(
+            coordinator=entry.runtime_data.coordinator,
+            entity_description=entity_description,
+        )
+        for entity_description in DIAGNOSTIC_DESCRIPTIONS
+    )
 
 
 class SystemairSensor(SystemairEntity, SensorEntity):
@@ -147,7 +221,7 @@ class SystemairSensor(SystemairEntity, SensorEntity):
         entity_description: SystemairSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, registers=(entity_description.registry,))
         self.entity_description = entity_description
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
 
@@ -161,3 +235,38 @@ class SystemairSensor(SystemairEntity, SensorEntity):
             return VALUE_MAP_TO_ALARM_STATE.get(value, "Inactive")
 
         return str(value)
+
+
+class SystemairDiagnosticSensor(SystemairEntity, SensorEntity):
+    """Systemair sensor reporting on the connection to the unit."""
+
+    _attr_has_entity_name = True
+
+    entity_description: SystemairDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SystemairDataUpdateCoordinator,
+        entity_description: SystemairDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Also update when requests to the unit are paused or resumed, which happens between updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.config_entry.runtime_data.client.breaker.add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the connection is reported on most when the unit is unavailable."""
+        return True
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,91 @@
+"""Services for Systemair."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import selector
+
+from .const import DOMAIN
+from .modbus import RegisterType, register_type_map
+
+if TYPE_CHECKING:
+    from .data import SystemairConfigEntry
+
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_REGISTERS = "registers"
+
+# Only holding registers can be written. Sensor values are holding registers too, but only the unit updates them
+WRITABLE_PARAMETERS = {
+    param.short: param
+    for param in register_type_map[RegisterType.Holding].values()
+    if not param.short.startswith("REG_SENSOR_")
+}
+
+SERVICE_WRITE_REGISTERS = "write_registers"
+SERVICE_WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): selector.ConfigEntrySelector(
+            {
+                "integration": DOMAIN,
+            }
+        ),
+        vol.Required(ATTR_REGISTERS): vol.Schema(
+            {
+                vol.In(WRITABLE_PARAMETERS): vol.Any(bool, vol.Coerce(float)),
+            }
+        ),
+    }
+)
+
+
+def _get_config_entry(hass: HomeAssistant, call: ServiceCall) -> SystemairConfigEntry:
+    """Get the loaded config entry targeted by the service call."""
+    entry_id: str = call.data[ATTR_CONFIG_ENTRY]
+    entry: SystemairConfigEntry | None = hass.config_entries.async_get_entry(entry_id)
+
+    if not entry:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_config_entry",
+            translation_placeholders={
+                "config_entry": entry_id,
+            },
+        )
+    if entry.state != ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unloaded_config_entry",
+            translation_placeholders={
+                "config_entry": entry.title,
+            },
+        )
+
+    return entry
+
+
+async def _async_write_registers(call: ServiceCall, *, hass: HomeAssistant) -> None:
+    """Write several registers to the unit in a single request."""
+    entry = _get_config_entry(hass, call)
+    values = {}
+    for short, value in call.data[ATTR_REGISTERS].items():
+        register = WRITABLE_PARAMETERS[short]
+        values[register] = bool(value) if register.boolean else value
+
+    await entry.runtime_data.coordinator.set_modbus_data_batch(values)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up Systemair services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_REGISTERS,
+        partial(_async_write_registers, hass=hass),
+        schema=SERVICE_WRITE_REGISTERS_SCHEMA,
+    )
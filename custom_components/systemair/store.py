@@ -0,0 +1,111 @@
+"""Storage of what is known about a Systemair unit between restarts."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import DeviceIdentity
+from .const import DATA_STORES, DOMAIN, SNAPSHOT_MAX_AGE, SNAPSHOT_SAVE_INTERVAL, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+
+class SystemairStore:
+    """Stores what is known about a unit, one file per config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store, nothing is loaded until async_load."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._data: dict[str, Any] = {}
+        self._next_snapshot_save = 0.0
+        # Whether the data changed since it was last written
+        self._unsaved = False
+
+    async def async_load(self) -> None:
+        """Load what was stored by an earlier start."""
+        self._data = await self._store.async_load() or {}
+
+    async def async_save(self) -> None:
+        """Write the stored data right away, replacing a pending delayed save."""
+        self._unsaved = False
+        await self._store.async_save(self._data)
+
+    async def async_flush(self) -> None:
+        """Write changes not written yet, so no delayed save is left pending."""
+        if self._unsaved:
+            await self.async_save()
+
+    async def async_remove(self) -> None:
+        """Remove the stored data, cancelling a pending delayed save."""
+        self._unsaved = False
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data written by a delayed save."""
+        self._unsaved = False
+        return self._data
+
+    @callback
+    def _async_delay_save(self, delay: float) -> None:
+        """Write the data after a delay."""
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, delay)
+
+    @property
+    def identity(self) -> DeviceIdentity | None:
+        """Return the stored identity of the unit, None if it was never fetched."""
+        if (identity := self._data.get("device_info")) is None:
+            return None
+        return DeviceIdentity(**identity)
+
+    @callback
+    def async_set_identity(self, identity: DeviceIdentity) -> None:
+        """Store the identity of the unit."""
+        self._data["device_info"] = asdict(identity)
+        self._async_delay_save(STORAGE_SAVE_DELAY)
+
+    @property
+    def snapshot(self) -> tuple[dict[int, Any], datetime] | None:
+        """Return the stored register values and when they were read, None if missing or too old."""
+        if (snapshot := self._data.get("snapshot")) is None:
+            return None
+        updated = dt_util.parse_datetime(snapshot["updated"])
+        if updated is None or dt_util.utcnow() - updated > SNAPSHOT_MAX_AGE:
+            return None
+        # JSON stores the register addresses as strings
+        return {int(key): value for key, value in snapshot["data"].items()}, updated
+
+    @callback
+    def async_set_snapshot(self, data: Mapping[int, Any], updated: datetime) -> None:
+        """Store the register values, written at most once per save interval and when shutting down."""
+        self._data["snapshot"] = {"data": data, "updated": updated.isoformat()}
+        self._unsaved = True
+        # A delayed save is pushed back by every call, so it is only scheduled when none is pending
+        if (now := time.monotonic()) >= self._next_snapshot_save:
+            self._next_snapshot_save = now + SNAPSHOT_SAVE_INTERVAL
+            self._async_delay_save(SNAPSHOT_SAVE_INTERVAL)
+
+
+@callback
+def async_get_store(hass: HomeAssistant, entry_id: str) -> SystemairStore:
+    """Return the store of a config entry, the same one for every setup of the entry until it is removed."""
+    stores: dict[str, SystemairStore] = hass.data.setdefault(DATA_STORES, {})
+    if (store := stores.get(entry_id)) is None:
+        store = stores[entry_id] = SystemairStore(hass, entry_id)
+    return store
+
+
+async def async_remove_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored data of a removed config entry."""
+    await async_get_store(hass, entry_id).async_remove()
+    hass.data[DATA_STORES].pop(entry_id)
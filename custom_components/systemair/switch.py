@@ -34,6 +34,10 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+ENTITY_REGISTERS = tuple(
+    (entity_description, (entity_description.registry,)) for entity_description in ENTITY_DESCRIPTIONS
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
@@ -63,7 +67,7 @@ class SystemairSwitch(SystemairEntity, SwitchEntity):
         entity_description: SystemairSwitchEntityDescription,
     ) -> None:
         """Initialize the switch class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, registers=(entity_description.registry,))
         self.entity_description = entity_description
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{entity_description.key}"
 
@@ -75,9 +79,7 @@ class SystemairSwitch(SystemairEntity, SwitchEntity):
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
         await self.coordinator.set_modbus_data(self.entity_description.registry, value=True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
         await self.coordinator.set_modbus_data(self.entity_description.registry, value=False)
-        await self.coordinator.async_request_refresh()
@@ -0,0 +1,283 @@
+"""
+Benchmark of the poll, decode and notify pipeline.
+
+Runs coordinator update cycles against in-process IAM simulators, for growing register catalogs and numbers of
+config entries sharing one event loop, and stores the timings as JSON. Needs the development requirements:
+
+    python scripts/benchmark.py --output benchmark.json
+    python scripts/benchmark.py --compare benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from aiohttp import web
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from iam_simulator import SIMULATOR_KEY, IamSimulatorConfig, create_app
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.systemair.api import SystemairApiClient
+from custom_components.systemair.const import DOMAIN
+from custom_components.systemair.coordinator import SystemairDataUpdateCoordinator
+from custom_components.systemair.data import SystemairData
+from custom_components.systemair.modbus import (
+    IntegerType,
+    ModbusParameter,
+    RegisterType,
+    parameters_list,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Synthetic registers are placed above the catalog, so they never collide with real ones
+SYNTHETIC_REGISTER_START = 20001
+DEFAULT_CATALOG_SIZES = (len(parameters_list), 200, 500)
+DEFAULT_ENTRY_COUNTS = (1, 10, 50)
+
+
+@dataclass(kw_only=True)
+class Scenario:
+    """One combination of catalog size and number of config entries."""
+
+    catalog_size: int
+    entries: int
+    rounds: int
+    latency: float
+
+    @property
+    def name(self) -> str:
+        """Return the key of the scenario in the results."""
+        return f"catalog={self.catalog_size},entries={self.entries}"
+
+
+@dataclass(kw_only=True)
+class Device:
+    """A simulated unit and the coordinator polling it."""
+
+    runner: web.AppRunner
+    app: web.Application
+    coordinator: SystemairDataUpdateCoordinator
+    cycles: list[float] = field(default_factory=list)
+
+
+def build_catalog(size: int) -> list[ModbusParameter]:
+    """Return the register catalog, padded with synthetic registers up to the given size."""
+    catalog = list(parameters_list[:size])
+    catalog.extend(
+        ModbusParameter(
+            register=SYNTHETIC_REGISTER_START + index,
+            sig=IntegerType.INT if index % 2 else IntegerType.UINT,
+            reg_type=RegisterType.Input if index % 3 else RegisterType.Holding,
+            short=f"REG_BENCHMARK_{index}",
+            description="Synthetic register",
+            scale_factor=10 if index % 4 == 0 else None,
+        )
+        for index in range(size - len(catalog))
+    )
+    return catalog
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize timings in seconds as milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def time_repeated(function: Callable[[], Any], repeat: int) -> list[float]:
+    """Time repeated calls of a synchronous function."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def async_start_device(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    catalog: list[ModbusParameter],
+    latency: float,
+) -> Device:
+    """Start a simulator and a coordinator polling it, with a listener per register decoding it like an entity."""
+    app = create_app(IamSimulatorConfig(latency=latency))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001 Port picked by the OS
+
+    entry = config_entries.ConfigEntry(
+        data={},
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        # Only the benchmark refreshes, scheduled refreshes would run during the timed rounds
+        pref_disable_polling=True,
+        source=config_entries.SOURCE_USER,
+        title=f"Benchmark {port}",
+        unique_id=None,
+        version=1,
+    )
+    config_entries.current_entry.set(entry)
+    coordinator = SystemairDataUpdateCoordinator(hass)
+    entry.runtime_data = SystemairData(
+        client=SystemairApiClient(f"127.0.0.1:{port}", session),
+        coordinator=coordinator,
+        integration=None,
+    )
+
+    for param in catalog:
+        coordinator.register_modbus_parameters(param)
+        coordinator.async_add_listener(
+            lambda param=param: coordinator.get_modbus_data(param),
+            coordinator.register_keys((param,)),
+        )
+    return Device(runner=runner, app=app, coordinator=coordinator)
+
+
+def perturb(device: Device, generation: int) -> None:
+    """Change every register on the simulated unit, so each cycle decodes and notifies everything."""
+    bank = device.app[SIMULATOR_KEY].bank
+    for registers in (bank.input, bank.holding):
+        for address in registers:
+            registers[address] = generation & 0xFF
+
+
+async def async_timed_refresh(device: Device) -> None:
+    """Run one update cycle, reading every register regardless of its poll interval."""
+    device.coordinator._next_poll.clear()  # noqa: SLF001 Measure the full cycle
+    start = time.perf_counter()
+    await device.coordinator.async_refresh()
+    device.cycles.append(time.perf_counter() - start)
+
+
+async def async_run_scenario(hass: HomeAssistant, scenario: Scenario) -> dict[str, Any]:
+    """Run a scenario and return its results."""
+    catalog = build_catalog(scenario.catalog_size)
+    async with aiohttp.ClientSession() as session:
+        devices = [await async_start_device(hass, session, catalog, scenario.latency) for _ in range(scenario.entries)]
+        try:
+            # Warm up connections and caches
+            await asyncio.gather(*(async_timed_refresh(device) for device in devices))
+            for device in devices:
+                device.cycles.clear()
+            rounds = []
+            for generation in range(1, scenario.rounds + 1):
+                for device in devices:
+                    perturb(device, generation)
+                start = time.perf_counter()
+                await asyncio.gather(*(async_timed_refresh(device) for device in devices))
+                rounds.append(time.perf_counter() - start)
+
+            coordinator = devices[0].coordinator
+            client: SystemairApiClient = coordinator.config_entry.runtime_data.client
+            spans = [span for request in client.plan_requests(catalog) for span in request]
+            stats = devices[0].app[SIMULATOR_KEY].stats
+
+            def decode_all() -> None:
+                coordinator.data = coordinator.data
+                for param in catalog:
+                    coordinator.get_modbus_data(param)
+
+            def build_urls() -> None:
+                for chunk in client.plan_requests(catalog):
+                    client._mread_url(chunk)  # noqa: SLF001
+
+            return {
+                "catalog_size": scenario.catalog_size,
+                "entries": scenario.entries,
+                "rounds": scenario.rounds,
+                "latency": scenario.latency,
+                "spans": len(spans),
+                "requests_per_cycle": stats.reads / (scenario.rounds + 1),
+                "round": summarize(rounds),
+                "cycle": summarize([cycle for device in devices for cycle in device.cycles]),
+                "url": summarize(time_repeated(build_urls, scenario.rounds)),
+                "decode": summarize(time_repeated(decode_all, scenario.rounds)),
+            }
+        finally:
+            for device in devices:
+                await device.coordinator.async_shutdown()
+                await device.runner.cleanup()
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return the scenarios whose median cycle regressed beyond the tolerance."""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        if (previous := baseline.get("scenarios", {}).get(name)) is None:
+            continue
+        for stage in ("cycle", "url", "decode"):
+            before, after = previous[stage]["median_ms"], result[stage]["median_ms"]
+            if after > before * (1 + tolerance):
+                regressions.append(f"{name} {stage}: {before:.3f} ms -> {after:.3f} ms")
+    return regressions
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Run all scenarios, store the results and compare them with a baseline."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        results: dict[str, Any] = {"python": sys.version.split()[0], "scenarios": {}}
+        try:
+            for catalog_size in args.catalog_sizes:
+                for entries in args.entries:
+                    scenario = Scenario(
+                        catalog_size=catalog_size, entries=entries, rounds=args.rounds, latency=args.latency
+                    )
+                    result = await async_run_scenario(hass, scenario)
+                    results["scenarios"][scenario.name] = result
+                    print(
+                        f"{scenario.name}: cycle median {result['cycle']['median_ms']:.2f} ms, "
+                        f"p95 {result['cycle']['p95_ms']:.2f} ms, round median {result['round']['median_ms']:.2f} ms"
+                    )
+        finally:
+            await hass.async_stop(force=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if regressions := compare(results, baseline, args.tolerance):
+            print("Regressions:\n" + "\n".join(regressions))
+            return 1
+        print("No regressions")
+    return 0
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=DEFAULT_CATALOG_SIZES)
+    parser.add_argument("--entries", type=int, nargs="+", default=DEFAULT_ENTRY_COUNTS)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the simulators add to every request")
+    parser.add_argument("--output", help="file to store the results in")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown compared to the baseline")
+    sys.exit(asyncio.run(async_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Local simulator of the SAVE Connect IAM web interface.
+
+Serves `/menu`, `/unit_version`, `/mread` and `/mwrite` on top of the register bank of the Modbus TCP simulator,
+so the HTTP client and the coordinator can be exercised, measured and regression tested without a physical unit:
+
+    python scripts/iam_simulator.py --port 8080 --latency 0.05 --jitter 0.02 --disconnect-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from urllib.parse import unquote
+
+from aiohttp import web
+from modbus_simulator import RegisterBank
+
+SIMULATOR_KEY = web.AppKey("simulator", "IamSimulator")
+
+
+@dataclass(kw_only=True)
+class IamSimulatorConfig:
+    """Behaviour of the simulated IAM."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    disconnect_rate: float = 0.0
+    error_rate: float = 0.0
+    max_url_length: int | None = None
+    max_registers_per_request: int | None = None
+    # The IAM relays one request at a time to the unit
+    serial: bool = True
+    seed: int | None = None
+
+
+@dataclass(kw_only=True)
+class IamSimulatorStats:
+    """Requests served by the simulator."""
+
+    requests: int = 0
+    reads: int = 0
+    writes: int = 0
+    registers_read: int = 0
+    registers_written: int = 0
+    disconnects: int = 0
+    errors: int = 0
+    rejected: int = 0
+    endpoints: dict[str, int] = field(default_factory=dict)
+
+
+class IamSimulator:
+    """Simulated SAVE Connect IAM."""
+
+    def __init__(self, bank: RegisterBank, config: IamSimulatorConfig) -> None:
+        """Set up the simulated IAM on top of a register bank."""
+        self.bank = bank
+        self.config = config
+        self.stats = IamSimulatorStats()
+        self._random = random.Random(config.seed)  # noqa: S311 Not used for cryptographic purposes
+        self._lock = asyncio.Lock()
+
+    async def _async_delay(self) -> None:
+        """Wait for the simulated round trip to the unit."""
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _query(self, request: web.Request) -> dict[str, int]:
+        """Decode the JSON object passed as query string."""
+        return json.loads(unquote(request.rel_url.raw_query_string) or "{}")
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler: web.RequestHandler) -> web.StreamResponse:
+        """Apply the configured limits, latency and failures to every request."""
+        self.stats.requests += 1
+        self.stats.endpoints[request.path] = self.stats.endpoints.get(request.path, 0) + 1
+        if self.config.max_url_length is not None and len(str(request.rel_url)) > self.config.max_url_length:
+            self.stats.rejected += 1
+            raise web.HTTPRequestURITooLong
+        if self.config.max_registers_per_request is not None and request.path == "/mread":
+            registers = sum(self._query(request).values())
+            if registers > self.config.max_registers_per_request:
+                self.stats.rejected += 1
+                raise web.HTTPRequestEntityTooLarge(
+                    max_size=self.config.max_registers_per_request, actual_size=registers
+                )
+
+        if self.config.serial:
+            async with self._lock:
+                await self._async_delay()
+                disconnected, failed = self._draw_failures()
+        else:
+            await self._async_delay()
+            disconnected, failed = self._draw_failures()
+        if request.path in ("/mread", "/mwrite"):
+            if failed:
+                self.stats.errors += 1
+                raise web.HTTPInternalServerError
+            if disconnected:
+                self.stats.disconnects += 1
+                return web.Response(text="MB DISCONNECTED")
+        return await handler(request)
+
+    def _draw_failures(self) -> tuple[bool, bool]:
+        """Draw whether a request is answered with MB DISCONNECTED and whether it fails with a server error."""
+        disconnected = self._random.random() < self.config.disconnect_rate
+        # Only drawn when errors are injected, so seeded runs without them read the same sequence as before
+        failed = self.config.error_rate > 0 and self._random.random() < self.config.error_rate
+        return disconnected, failed
+
+    async def menu(self, _request: web.Request) -> web.Response:
+        """Return the menu, holding the MAC address of the IAM."""
+        return web.json_response({"mac": "00:00:5e:00:53:01"})
+
+    async def unit_version(self, _request: web.Request) -> web.Response:
+        """Return the versions of the unit."""
+        return web.json_response(
+            {
+                "System Serial Number": "SIM0000001",
+                "MB HW version": "1",
+                "MB Model": "SAVE Simulator",
+                "MB SW version": "1.0.0",
+                "IAM SW version": "1.0.0",
+            }
+        )
+
+    async def mread(self, request: web.Request) -> web.Response:
+        """Read registers, a count above one returns the following registers as a list."""
+        self.stats.reads += 1
+        response: dict[str, int | list[int]] = {}
+        for key, count in self._query(request).items():
+            start = int(key)
+            self.stats.registers_read += count
+            values = [self.bank.read(start + offset) for offset in range(count)]
+            response[key] = values if count > 1 else values[0]
+        return web.json_response(response)
+
+    async def mwrite(self, request: web.Request) -> web.Response:
+        """Write registers."""
+        self.stats.writes += 1
+        for key, value in self._query(request).items():
+            self.stats.registers_written += 1
+            self.bank.write(int(key), int(value))
+        return web.Response(text="OK")
+
+    async def stats_handler(self, _request: web.Request) -> web.Response:
+        """Return the requests served so far."""
+        return web.json_response(self.stats.__dict__)
+
+
+def create_app(config: IamSimulatorConfig | None = None, bank: RegisterBank | None = None) -> web.Application:
+    """Create the web application of the simulator."""
+    simulator = IamSimulator(bank or RegisterBank(), config or IamSimulatorConfig())
+    app = web.Application(middlewares=[simulator.middleware])
+    app[SIMULATOR_KEY] = simulator
+    app.router.add_get("/menu", simulator.menu)
+    app.router.add_get("/unit_version", simulator.unit_version)
+    app.router.add_get("/mread", simulator.mread)
+    app.router.add_get("/mwrite", simulator.mwrite)
+    app.router.add_get("/stats", simulator.stats_handler)
+    return app
+
+
+def main() -> None:
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random seconds added on top of the latency")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="share of reads and writes failing")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of reads and writes failing with status 500"
+    )
+    parser.add_argument("--max-url-length", type=int, default=None, help="reject longer urls with status 414")
+    parser.add_argument(
+        "--max-registers-per-request", type=int, default=None, help="reject reads of more registers with status 413"
+    )
+    parser.add_argument("--parallel", action="store_true", help="serve requests concurrently")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = IamSimulatorConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        disconnect_rate=args.disconnect_rate,
+        error_rate=args.error_rate,
+        max_url_length=args.max_url_length,
+        max_registers_per_request=args.max_registers_per_request,
+        serial=not args.parallel,
+        seed=args.seed,
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Local Modbus TCP simulator of a Systemair unit.
+
+Serves the registers of `modbus.parameters_list` over Modbus TCP, so the Modbus TCP transport can be exercised
+without a physical unit:
+
+    python scripts/modbus_simulator.py --port 5020
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import struct
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+MBAP_HEADER = struct.Struct(">HHHB")
+
+FUNCTION_READ_HOLDING_REGISTERS = 0x03
+FUNCTION_READ_INPUT_REGISTERS = 0x04
+FUNCTION_WRITE_SINGLE_REGISTER = 0x06
+FUNCTION_WRITE_MULTIPLE_REGISTERS = 0x10
+EXCEPTION_FLAG = 0x80
+EXCEPTION_ILLEGAL_FUNCTION = 0x01
+EXCEPTION_ILLEGAL_DATA_ADDRESS = 0x02
+
+
+def load_modbus_module() -> ModuleType:
+    """Load the register catalog of the integration without importing Home Assistant."""
+    path = Path(__file__).parent.parent / "custom_components" / "systemair" / "modbus.py"
+    spec = importlib.util.spec_from_file_location("systemair_modbus", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+modbus = load_modbus_module()
+
+USERMODE_MODE = modbus.parameter_map["REG_USERMODE_MODE"].register - 1
+USERMODE_HMI_CHANGE_REQUEST = modbus.parameter_map["REG_USERMODE_HMI_CHANGE_REQUEST"].register - 1
+
+
+class RegisterBank:
+    """Register values of a simulated unit, keyed by zero based address."""
+
+    def __init__(self, *, strict: bool = False) -> None:
+        """Seed the bank from the register catalog, using the lowest allowed value of each register."""
+        self.strict = strict
+        self.input: dict[int, int] = {}
+        self.holding: dict[int, int] = {}
+        for param in modbus.parameters_list:
+            bank = self.input if param.reg_type == modbus.RegisterType.Input else self.holding
+            bank[param.register - 1] = (param.min_value or 0) & 0xFFFF
+
+    def read(self, address: int, *, holding: bool | None = None) -> int:
+        """
+        Read a register, unknown registers read as 0 unless the bank is strict.
+
+        Without a register type, the register is looked up in both banks, as the IAM does.
+        """
+        if holding is None:
+            holding = address not in self.input
+        bank = self.holding if holding else self.input
+        if address in bank:
+            return bank[address]
+        if self.strict:
+            raise KeyError(address)
+        return 0
+
+    def write(self, address: int, value: int) -> None:
+        """Write a holding register."""
+        if self.strict and address not in self.holding:
+            raise KeyError(address)
+        if address == USERMODE_HMI_CHANGE_REQUEST and value:
+            # Like the unit, act on the requested user mode and consume the request
+            self.input[USERMODE_MODE] = value - 1
+            value = 0
+        self.holding[address] = value & 0xFFFF
+
+
+class ModbusSimulator:
+    """Minimal Modbus TCP server on top of a register bank."""
+
+    def __init__(self, bank: RegisterBank) -> None:
+        """Serve the given register bank."""
+        self.bank = bank
+        self.connections = 0
+        # Requests left that are answered by closing the connection, like a unit dropping it
+        self.drop_requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer requests from a client until it disconnects."""
+        self.connections += 1
+        try:
+            while True:
+                transaction_id, protocol_id, length, unit_id = MBAP_HEADER.unpack(
+                    await reader.readexactly(MBAP_HEADER.size)
+                )
+                pdu = await reader.readexactly(length - 1)
+                if self.drop_requests > 0:
+                    self.drop_requests -= 1
+                    break
+                response = self.process(pdu)
+                writer.write(MBAP_HEADER.pack(transaction_id, protocol_id, len(response) + 1, unit_id) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def process(self, pdu: bytes) -> bytes:
+        """Return the response PDU for a request PDU."""
+        function = pdu[0]
+        try:
+            if function in (FUNCTION_READ_HOLDING_REGISTERS, FUNCTION_READ_INPUT_REGISTERS):
+                start, count = struct.unpack(">HH", pdu[1:5])
+                holding = function == FUNCTION_READ_HOLDING_REGISTERS
+                values = [self.bank.read(start + offset, holding=holding) for offset in range(count)]
+                return struct.pack(f">BB{count}H", function, count * 2, *values)
+            if function == FUNCTION_WRITE_SINGLE_REGISTER:
+                address, value = struct.unpack(">HH", pdu[1:5])
+                self.bank.write(address, value)
+                return pdu[:5]
+            if function == FUNCTION_WRITE_MULTIPLE_REGISTERS:
+                start, count = struct.unpack(">HH", pdu[1:5])
+                for offset, value in enumerate(struct.unpack(f">{count}H", pdu[6 : 6 + count * 2])):
+                    self.bank.write(start + offset, value)
+                return pdu[:5]
+        except KeyError:
+            return bytes([function | EXCEPTION_FLAG, EXCEPTION_ILLEGAL_DATA_ADDRESS])
+        return bytes([function | EXCEPTION_FLAG, EXCEPTION_ILLEGAL_FUNCTION])
+
+
+async def main() -> None:
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--strict", action="store_true", help="answer reads of unknown registers with an exception")
+    args = parser.parse_args()
+
+    simulator = ModbusSimulator(RegisterBank(strict=args.strict))
+    server = await asyncio.start_server(simulator.handle, args.host, args.port)
+    print(f"Modbus TCP simulator listening on {args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
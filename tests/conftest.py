@@ -0,0 +1,108 @@
+"""Fixtures for the Systemair tests, running the integration against the simulators in scripts/."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import pytest
+from aiohttp import web
+from homeassistant.const import CONF_IP_ADDRESS
+from iam_simulator import SIMULATOR_KEY, IamSimulator, IamSimulatorConfig, create_app
+from modbus_simulator import ModbusSimulator, RegisterBank
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.systemair.const import CONF_TRANSPORT, DOMAIN, TRANSPORT_IAM
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+type WebServerFactory = Callable[[web.Application], Awaitable[str]]
+type IamSimulatorFactory = Callable[..., Awaitable[tuple[IamSimulator, str]]]
+type EntrySetupFactory = Callable[..., Awaitable[MockConfigEntry]]
+type ModbusSimulatorFactory = Callable[..., Awaitable[tuple[ModbusSimulator, str, int]]]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the integration from custom_components."""
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Return a session for talking to the simulators."""
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest.fixture
+async def web_server(socket_enabled: None) -> AsyncIterator[WebServerFactory]:  # noqa: ARG001 Servers listen on localhost
+    """Return a function serving a web application, returning its address."""
+    runners: list[web.AppRunner] = []
+
+    async def start(app: web.Application) -> str:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        runners.append(runner)
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001 The port is picked by the OS
+        return f"127.0.0.1:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def iam_simulator(web_server: WebServerFactory) -> IamSimulatorFactory:
+    """Return a function starting a simulated IAM, returning it and its address."""
+
+    async def start(
+        config: IamSimulatorConfig | None = None, bank: RegisterBank | None = None
+    ) -> tuple[IamSimulator, str]:
+        app = create_app(config, bank)
+        return app[SIMULATOR_KEY], await web_server(app)
+
+    return start
+
+
+@pytest.fixture
+async def modbus_simulator(socket_enabled: None) -> AsyncIterator[ModbusSimulatorFactory]:  # noqa: ARG001 Simulators listen on localhost
+    """Return a function starting a simulated Modbus TCP unit, returning it, its host and its port."""
+    servers: list[asyncio.Server] = []
+
+    async def start(bank: RegisterBank | None = None) -> tuple[ModbusSimulator, str, int]:
+        simulator = ModbusSimulator(bank or RegisterBank())
+        server = await asyncio.start_server(simulator.handle, "127.0.0.1", 0)
+        servers.append(server)
+        return simulator, "127.0.0.1", server.sockets[0].getsockname()[1]
+
+    yield start
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+def setup_entry(hass: HomeAssistant) -> EntrySetupFactory:
+    """Return a function setting up a config entry for the IAM at an address, passing keywords to the entry."""
+
+    async def setup(address: str, **kwargs: Any) -> MockConfigEntry:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_IP_ADDRESS: address, CONF_TRANSPORT: TRANSPORT_IAM},
+            unique_id=address,
+            **kwargs,
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry
+
+    return setup
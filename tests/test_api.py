@@ -0,0 +1,224 @@
+"""Tests for the client of the SAVE Connect IAM web interface, run against the IAM simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp import web
+from iam_simulator import IamSimulatorConfig
+
+from custom_components.systemair.api import (
+    RetryPolicy,
+    SystemairApiClient,
+    SystemairApiClientCommunicationError,
+    SystemairApiClientError,
+    SystemairApiClientLimits,
+    SystemairApiClientRequestTooLargeError,
+    SystemairApiClientUnavailableError,
+)
+from custom_components.systemair.breaker import BreakerState
+from custom_components.systemair.modbus import parameter_map, parameters_list
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .conftest import IamSimulatorFactory, WebServerFactory
+
+# Retried right away, so the tests do not wait for the backoff
+NO_BACKOFF = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+async def test_read_within_register_limit(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """No request reads more registers than allowed, not even a single span."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(max_registers_per_request=10))
+    client = SystemairApiClient(
+        address, session, SystemairApiClientLimits(max_register_gap=50, max_registers_per_request=10)
+    )
+
+    requests = client.plan_requests(parameters_list)
+    assert all(sum(span.count for span in request) <= 10 for request in requests)
+
+    data = await client.async_get_data(parameters_list)
+    assert {param.register - 1 for param in parameters_list} <= data.keys()
+    assert simulator.stats.reads == len(requests)
+    assert simulator.stats.rejected == 0
+
+
+async def test_read_learns_register_limit(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """Spans the unit rejects as too large are split, and later requests stay within the learned limit."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(max_registers_per_request=20))
+    client = SystemairApiClient(address, session, SystemairApiClientLimits(max_register_gap=50))
+    assert any(span.count > 20 for request in client.plan_requests(parameters_list) for span in request)
+
+    registers = {param.register - 1 for param in parameters_list}
+    assert registers <= (await client.async_get_data(parameters_list)).keys()
+    assert simulator.stats.rejected > 0
+
+    requests = client.plan_requests(parameters_list)
+    assert all(sum(span.count for span in request) <= 20 for request in requests)
+    simulator.stats.rejected = 0
+    assert registers <= (await client.async_get_data(parameters_list)).keys()
+    assert simulator.stats.rejected == 0
+
+
+async def test_retry_disconnected(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """Reads the IAM answers with MB DISCONNECTED are retried until they succeed."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(disconnect_rate=0.3, seed=1))
+    client = SystemairApiClient(
+        address,
+        session,
+        SystemairApiClientLimits(retry_disconnected=RetryPolicy(attempts=10, base_delay=0, max_delay=0)),
+    )
+
+    registers = {param.register - 1 for param in parameters_list}
+    for _ in range(5):
+        assert registers <= (await client.async_get_data(parameters_list)).keys()
+    assert simulator.stats.disconnects > 0
+    assert client.metrics.retries == simulator.stats.disconnects
+    assert client.metrics.errors == {"SystemairApiClientDisconnectedError": simulator.stats.disconnects}
+    assert client.breaker.state == BreakerState.CLOSED
+
+
+async def test_retries_exhausted(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """A read failing on every attempt raises an error after the attempts of its retry policy."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(disconnect_rate=1))
+    client = SystemairApiClient(address, session, SystemairApiClientLimits(retry_disconnected=NO_BACKOFF))
+
+    with pytest.raises(SystemairApiClientError, match="mb disconnect"):
+        await client.async_get_data([parameter_map["REG_USERMODE_MODE"]])
+    assert simulator.stats.disconnects == 3
+    assert client.metrics.retries == 2
+    assert client.breaker.failures == 1
+
+
+async def test_retry_timeout(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """Reads slower than the request timeout are retried, then raise a communication error."""
+    _, address = await iam_simulator(IamSimulatorConfig(latency=0.5, serial=False))
+    client = SystemairApiClient(
+        address,
+        session,
+        SystemairApiClientLimits(request_timeout=0.1, min_request_timeout=0.1, retry_timeout=NO_BACKOFF),
+    )
+
+    with pytest.raises(SystemairApiClientCommunicationError, match="Timeout"):
+        await client.async_get_data([parameter_map["REG_USERMODE_MODE"]])
+    assert client.metrics.errors == {"TimeoutError": 3}
+    assert client.metrics.retries == 2
+
+
+async def test_server_error_not_retried(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """Unexpected responses are not retried."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(error_rate=1))
+    client = SystemairApiClient(address, session, SystemairApiClientLimits(retry_disconnected=NO_BACKOFF))
+
+    with pytest.raises(SystemairApiClientError):
+        await client.async_get_data([parameter_map["REG_USERMODE_MODE"]])
+    assert simulator.stats.errors == 1
+    assert client.metrics.retries == 0
+    assert client.breaker.failures == 1
+
+
+async def test_breaker_opens(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """The breaker opens after three failed polls, after which reads fail without reaching the unit."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(disconnect_rate=1))
+    client = SystemairApiClient(address, session, SystemairApiClientLimits(retry_disconnected=NO_BACKOFF))
+    registers = [parameter_map["REG_USERMODE_MODE"]]
+
+    for _ in range(3):
+        assert client.breaker.state == BreakerState.CLOSED
+        with pytest.raises(SystemairApiClientError):
+            await client.async_get_data(registers)
+    assert client.breaker.state == BreakerState.OPEN
+
+    requests = simulator.stats.requests
+    start = time.monotonic()
+    with pytest.raises(SystemairApiClientUnavailableError):
+        await client.async_get_data(registers)
+    assert time.monotonic() - start < 0.1
+    assert simulator.stats.requests == requests
+
+
+async def test_read_learns_span_limit(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """Requests the unit rejects as too long are halved, and later requests stay within the learned span limit."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(max_url_length=120))
+    client = SystemairApiClient(address, session, SystemairApiClientLimits(max_register_gap=0))
+    # Eight spans of a single five digit register each, whose url of about 125 characters the unit rejects
+    registers = [param for param in parameters_list if param.register > 10001][::2][:8]
+    assert [len(request) for request in client.plan_requests(registers)] == [8]
+
+    expected = {param.register - 1 for param in registers}
+    assert (await client.async_get_data(registers)).keys() == expected
+    assert simulator.stats.rejected == 1
+    assert client._max_spans_per_request == 4  # noqa: SLF001 Learned limit
+    assert [len(request) for request in client.plan_requests(registers)] == [4, 4]
+
+    simulator.stats.rejected = 0
+    assert (await client.async_get_data(registers)).keys() == expected
+    assert simulator.stats.rejected == 0
+
+
+async def test_breaker_counts_polls(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """A failed read counts once towards the breaker, however many requests it was sent in."""
+    _, address = await iam_simulator(IamSimulatorConfig(disconnect_rate=1))
+    client = SystemairApiClient(
+        address,
+        session,
+        SystemairApiClientLimits(max_registers_per_request=10, retry_disconnected=NO_BACKOFF),
+    )
+    assert len(client.plan_requests(parameters_list)) >= 3
+
+    with pytest.raises(SystemairApiClientError):
+        await client.async_get_data(parameters_list)
+    assert client.breaker.failures == 1
+    assert client.breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.parametrize(
+    ("status", "body", "too_large"),
+    [
+        (414, "Request-URI Too Long", True),
+        (431, "Request Header Fields Too Large", True),
+        (400, "Bad Request: URL too long", True),
+        (400, "Bad Request", False),
+    ],
+)
+async def test_request_too_large_status(
+    web_server: WebServerFactory,
+    session: aiohttp.ClientSession,
+    status: int,
+    body: str,
+    *,
+    too_large: bool,
+) -> None:
+    """Only statuses and Bad Request bodies telling the request was too long count as too large."""
+
+    async def mread(_request: web.Request) -> web.Response:
+        return web.Response(status=status, text=body)
+
+    app = web.Application()
+    app.router.add_get("/mread", mread)
+    client = SystemairApiClient(await web_server(app), session)
+
+    with pytest.raises(SystemairApiClientError) as exc_info:
+        await client.async_get_data([parameter_map["REG_USERMODE_MODE"]])
+    assert isinstance(exc_info.value, SystemairApiClientRequestTooLargeError) is too_large
+
+
+async def test_write_ahead_of_reads(iam_simulator: IamSimulatorFactory, session: aiohttp.ClientSession) -> None:
+    """A write is sent ahead of the reads already waiting for the unit."""
+    simulator, address = await iam_simulator(IamSimulatorConfig(latency=0.01))
+    client = SystemairApiClient(
+        address, session, SystemairApiClientLimits(max_registers_per_request=10, max_concurrent_requests=1)
+    )
+    requests = len(client.plan_requests(parameters_list))
+    assert requests >= 3
+
+    read = asyncio.create_task(client.async_get_data(parameters_list))
+    await asyncio.sleep(0)
+    await client.async_set_data(parameter_map["REG_USERMODE_AWAY_AIRFLOW_LEVEL_SAF"], 2)
+    assert simulator.stats.reads < requests
+    await read
+    assert simulator.stats.reads == requests
@@ -0,0 +1,51 @@
+"""Tests for the update coordinator, run against the IAM simulator."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import EntrySetupFactory, IamSimulatorFactory
+
+
+async def test_scheduled_updates(
+    hass: HomeAssistant, iam_simulator: IamSimulatorFactory, setup_entry: EntrySetupFactory
+) -> None:
+    """Updates run once per interval while the entry is loaded."""
+    simulator, address = await iam_simulator()
+    entry = await setup_entry(address)
+    coordinator = entry.runtime_data.coordinator
+
+    for _ in range(3):
+        reads = simulator.stats.reads
+        # The update slot of the unit lies within half an interval of one interval from now
+        async_fire_time_changed(hass, dt_util.utcnow() + coordinator.interval * 2)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert simulator.stats.reads > reads
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    reads = simulator.stats.reads
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+    assert simulator.stats.reads == reads
+
+
+async def test_polling_disabled(
+    hass: HomeAssistant, iam_simulator: IamSimulatorFactory, setup_entry: EntrySetupFactory
+) -> None:
+    """No updates are scheduled while polling is disabled for the entry."""
+    simulator, address = await iam_simulator()
+    entry = await setup_entry(address, pref_disable_polling=True)
+
+    reads = simulator.stats.reads
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+    assert simulator.stats.reads == reads
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,34 @@
+"""Tests for the diagnostics, run against the IAM simulator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.systemair.const import CONF_READ_ALARMS, CONF_READ_CONFIG
+from custom_components.systemair.diagnostics import async_get_config_entry_diagnostics
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import EntrySetupFactory, IamSimulatorFactory
+
+
+async def test_plan_leaves_out_turned_off_groups(
+    hass: HomeAssistant, iam_simulator: IamSimulatorFactory, setup_entry: EntrySetupFactory
+) -> None:
+    """The read plan only covers the registers the coordinator reads."""
+    _, address = await iam_simulator()
+    entry = await setup_entry(address, options={CONF_READ_ALARMS: False, CONF_READ_CONFIG: False})
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.disabled_parameters & coordinator.modbus_parameters.keys()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["coordinator"]["polled_registers"] < diagnostics["coordinator"]["registers"]
+    planned = {
+        span["start"] + offset for request in diagnostics["plan"] for span in request for offset in range(span["count"])
+    }
+    polled = {param.register - 1 for param in coordinator.polled_parameters()}
+    assert polled <= planned
+    everything = entry.runtime_data.client.plan_requests(coordinator.modbus_parameters)
+    assert len(planned) < sum(span.count for request in everything for span in request)
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,138 @@
+"""Tests for the Modbus TCP client, run against the Modbus TCP simulator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from modbus_simulator import RegisterBank
+
+from custom_components.systemair.api import (
+    RetryPolicy,
+    SystemairApiClientCommunicationError,
+    SystemairApiClientError,
+    SystemairApiClientLimits,
+)
+from custom_components.systemair.breaker import BreakerState
+from custom_components.systemair.modbus import (
+    IntegerType,
+    ModbusParameter,
+    RegisterType,
+    parameter_map,
+    parameters_list,
+)
+from custom_components.systemair.modbus_tcp import SystemairModbusTcpClient
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from .conftest import ModbusSimulatorFactory
+
+# Retried right away, so the tests do not wait for the backoff
+LIMITS = SystemairApiClientLimits(
+    retry_timeout=RetryPolicy(attempts=2, base_delay=0, max_delay=0),
+    retry_connection=RetryPolicy(attempts=2, base_delay=0, max_delay=0),
+)
+
+UNKNOWN_REGISTER = ModbusParameter(
+    register=30000,
+    sig=IntegerType.UINT,
+    reg_type=RegisterType.Holding,
+    short="REG_UNKNOWN",
+    description="Register the unit does not have",
+)
+
+
+@pytest.fixture
+async def clients() -> AsyncIterator[list[SystemairModbusTcpClient]]:
+    """Return a list of clients that are closed at the end of the test."""
+    clients: list[SystemairModbusTcpClient] = []
+    yield clients
+    for client in clients:
+        await client.async_close()
+
+
+async def test_read(modbus_simulator: ModbusSimulatorFactory, clients: list[SystemairModbusTcpClient]) -> None:
+    """Registers are read with the function matching their type."""
+    bank = RegisterBank()
+    mode = parameter_map["REG_USERMODE_MODE"]
+    airflow = parameter_map["REG_USERMODE_AWAY_AIRFLOW_LEVEL_SAF"]
+    bank.input[mode.register - 1] = 3
+    bank.holding[airflow.register - 1] = 2
+    _, host, port = await modbus_simulator(bank)
+    client = SystemairModbusTcpClient(host, port, limits=LIMITS)
+    clients.append(client)
+
+    data = await client.async_get_data(parameters_list)
+    assert {param.register - 1 for param in parameters_list} <= data.keys()
+    assert data[mode.register - 1] == 3
+    assert data[airflow.register - 1] == 2
+    assert client.metrics.requests == len(client.plan_requests(parameters_list))
+
+
+async def test_write_batch(modbus_simulator: ModbusSimulatorFactory, clients: list[SystemairModbusTcpClient]) -> None:
+    """Consecutive registers are written in a single request, others in a request each."""
+    simulator, host, port = await modbus_simulator()
+    client = SystemairModbusTcpClient(host, port, limits=LIMITS)
+    clients.append(client)
+    supply = parameter_map["REG_USERMODE_AWAY_AIRFLOW_LEVEL_SAF"]
+    extract = parameter_map["REG_USERMODE_AWAY_AIRFLOW_LEVEL_EAF"]
+    delay = parameter_map["REG_USERMODE_AWAY_TIME"]
+    assert extract.register == supply.register + 1
+
+    assert await client.async_set_data_batch({supply: 2, extract: 3, delay: 4}) == "OK"
+    assert simulator.bank.holding[supply.register - 1] == 2
+    assert simulator.bank.holding[extract.register - 1] == 3
+    assert simulator.bank.holding[delay.register - 1] == 4
+    assert client.metrics.requests == 2
+
+
+async def test_exception_response(
+    modbus_simulator: ModbusSimulatorFactory, clients: list[SystemairModbusTcpClient]
+) -> None:
+    """An exception response is raised without retrying it, the unit did respond."""
+    _, host, port = await modbus_simulator(RegisterBank(strict=True))
+    client = SystemairModbusTcpClient(host, port, limits=LIMITS)
+    clients.append(client)
+
+    with pytest.raises(SystemairApiClientError, match="Modbus exception 2") as exc_info:
+        await client.async_get_data([UNKNOWN_REGISTER])
+    assert not isinstance(exc_info.value, SystemairApiClientCommunicationError)
+    assert client.metrics.retries == 0
+    assert client.breaker.state == BreakerState.CLOSED
+
+    # The connection is still usable
+    assert await client.async_test_connection()
+
+
+async def test_reconnect(modbus_simulator: ModbusSimulatorFactory, clients: list[SystemairModbusTcpClient]) -> None:
+    """A dropped connection is reopened and the request retried."""
+    simulator, host, port = await modbus_simulator()
+    client = SystemairModbusTcpClient(host, port, limits=LIMITS)
+    clients.append(client)
+    assert await client.async_test_connection()
+
+    simulator.drop_requests = 1
+    assert await client.async_test_connection()
+    assert client.metrics.retries == 1
+    assert client.metrics.errors == {"IncompleteReadError": 1}
+    assert simulator.connections == 2
+    assert client.breaker.state == BreakerState.CLOSED
+
+
+async def test_retries_exhausted(
+    modbus_simulator: ModbusSimulatorFactory, clients: list[SystemairModbusTcpClient]
+) -> None:
+    """A request failing on every attempt raises a communication error and counts towards the breaker."""
+    simulator, host, port = await modbus_simulator()
+    client = SystemairModbusTcpClient(host, port, limits=LIMITS)
+    clients.append(client)
+
+    simulator.drop_requests = 2
+    with pytest.raises(SystemairApiClientCommunicationError):
+        await client.async_test_connection()
+    assert client.metrics.retries == 1
+    assert client.breaker.failures == 1
+
+    assert await client.async_test_connection()
+    assert client.breaker.failures == 0